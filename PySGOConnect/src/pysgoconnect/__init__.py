@@ -5,7 +5,9 @@ from pysgoconnect.schemas import Class
 from pysgoconnect.schemas import Organization
 from pysgoconnect.schemas import OrganizationInfo
 from pysgoconnect.schemas import Token
+from pysgoconnect.schemas import TokenBatchItem
 from pysgoconnect.schemas import TokenID
+from pysgoconnect.schemas import TokenLookupResult
 from pysgoconnect.schemas import User
 
 __all__ = [
@@ -15,7 +17,9 @@ __all__ = [
     "OrganizationInfo",
     "PySGOConnect",
     "Token",
+    "TokenBatchItem",
     "TokenID",
+    "TokenLookupResult",
     "User",
     "errors",
 ]
@@ -1,9 +1,18 @@
+import gzip
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from json import dumps
 from json import loads
 from typing import Any
+from typing import overload
 
 from httpx import URL
 from httpx import AsyncClient
 from httpx import HTTPStatusError
+from httpx import Request
+from httpx import Response
 from httpx import codes
 from pydantic import ValidationError
 
@@ -12,13 +21,18 @@ from pysgoconnect.errors import TokenNotFoundError
 from pysgoconnect.errors import TokenValidationError
 from pysgoconnect.errors import TransmissionProtocolSecurityError
 from pysgoconnect.schemas import Token
+from pysgoconnect.schemas import TokenBatchItem
 from pysgoconnect.schemas import TokenID
+from pysgoconnect.schemas import TokenLookupResult
 
 DEFAULT_BASE_URL: URL = URL("http://localhost:5000/")
 DEFAULT_VERSION_API: str = "v1"
 DEFAULT_REQUESTS_TIMEOUT: int = 5
 DEFAULT_MAX_ATTEMPTS: int = 5
 DEFAULT_BASE_RETRY_DELAY: float = 2
+DEFAULT_COMPRESSION_MIN_SIZE: int = 1024
+COMPRESSION_GZIP_LEVEL: int = 6
+DEFAULT_VALIDATOR_STORE_SIZE: int = 128
 LIB_VERSION: str = "0.0.0"
 
 
@@ -32,6 +46,9 @@ class PySGOConnect:
         base_retry_delay: float = DEFAULT_BASE_RETRY_DELAY,
         *,
         use_http2: bool = True,
+        compress_requests: bool = True,
+        compression_min_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
+        validator_store_size: int = DEFAULT_VALIDATOR_STORE_SIZE,
         debug: bool = False,
     ):
         """Инициализирует клиент для работы c API PySGOConnect.
@@ -48,6 +65,11 @@ class PySGOConnect:
             max_attempts (int, optional): Максимальное количество повторных попыток HTTP-запросов.
             base_retry_delay (float, optional): Начальное время задержки перед повторным запросом (секунды).
             use_http2 (bool, optional): Включить поддержку HTTP/2. По умолчанию True.
+            compress_requests (bool, optional): Сжимать тела запросов gzip (`Content-Encoding: gzip`). По умолчанию True.
+                Сжатые ответы (gzip, zstd) запрашиваются через `Accept-Encoding` и распаковываются всегда.
+            compression_min_size (int, optional): Минимальный размер тела запроса в байтах, c которого оно сжимается.
+            validator_store_size (int, optional): Сколько последних полученных токенов хранить вместе c их `ETag`, чтобы
+                `get_token` повторно запрашивал их условно (`If-None-Match`) и сервер отвечал `304` без тела. 0 отключает.
             debug (bool, optional): Включить режим отладки, при отключение разрешён только защищённый протокол https.
 
         Raises:
@@ -55,8 +77,13 @@ class PySGOConnect:
         """  # noqa: E501
         self.base_url = URL(base_url) if isinstance(base_url, str) else base_url
         self.version_api = version_api
+        self.compress_requests = compress_requests
+        self.compression_min_size = compression_min_size
+        self.validator_store_size = validator_store_size
         self.debug = debug
 
+        self._validators: OrderedDict[tuple[str, str | None], tuple[str, bytes]] = OrderedDict()
+
         if not debug and self.base_url.scheme != "https":
             raise TransmissionProtocolSecurityError("Transmission protocol is not protected use https")
 
@@ -71,6 +98,36 @@ class PySGOConnect:
             base_retry_delay=base_retry_delay,
         )
 
+    def _build_json_request(self, method: str, url: URL, json_payload: Any) -> Request:
+        content = dumps(json_payload, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+        headers = {"content-type": "application/json"}
+
+        if self.compress_requests and len(content) >= self.compression_min_size:
+            content = gzip.compress(content, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+            headers["content-encoding"] = "gzip"
+
+        return self._wrapped_async_client.client.build_request(
+            method=method,
+            url=url,
+            content=content,
+            headers=headers,
+        )
+
+    def _store_validator(self, key: tuple[str, str | None], response: Response) -> None:
+        etag = response.headers.get("etag")
+        if not self.validator_store_size or etag is None or "no-store" in response.headers.get("cache-control", ""):
+            self._drop_validators(key[0])
+            return
+
+        self._validators[key] = (etag, response.content)
+        self._validators.move_to_end(key)
+        while len(self._validators) > self.validator_store_size:
+            self._validators.popitem(last=False)
+
+    def _drop_validators(self, token_id: str) -> None:
+        for key in [key for key in self._validators if key[0] == token_id]:
+            del self._validators[key]
+
     def _parse_token(self, token: Token | dict[str, Any] | str) -> Token:
         if isinstance(token, str):
             token_dict = loads(token)
@@ -112,10 +169,10 @@ class PySGOConnect:
         json_payload = parsed_token.model_dump(mode="json")
 
         rq = await self._wrapped_async_client.request(
-            request=self._wrapped_async_client.client.build_request(
-                method="POST",
-                url=self.base_url.join(self.version_api + "/tokens"),
-                json=json_payload,
+            request=self._build_json_request(
+                "POST",
+                self.base_url.join(self.version_api + "/tokens"),
+                json_payload,
             ),
             requests_timeout=requests_timeout,
             max_attempts=max_attempts,
@@ -124,13 +181,81 @@ class PySGOConnect:
 
         return TokenID(**rq.json())
 
+    async def add_tokens(
+        self,
+        tokens: Sequence[Token | dict[str, Any] | str],
+        requests_timeout: int | None = None,
+        max_attempts: int | None = None,
+        base_retry_delay: float | None = None,
+    ) -> list[TokenBatchItem]:
+        """Добавляет несколько токенов одним запросом.
+
+        Args:
+            tokens (Sequence[Token | dict[str, Any] | str]): Токены в виде Pydantic классов или словарей/строк в формате **JSON**.
+            requests_timeout (int | None, optional): Таймаут в секундах; по умолчанию берётся из настроек клиента.
+            max_attempts (int | None, optional): Максимальное количество попыток запроса; по умолчанию из настроек.
+            base_retry_delay (float | None, optional): Начальное время ожидания перед повторным запросом; по умолчанию из настроек.
+
+        Raises:
+            TypeError: Если один из токенов не является `Token`, `dict` или `JSON-строкой`.
+            pydantic.ValidationError: Если данные одного из токенов не проходят валидацию модели `Token`.
+            HTTPStatusError: При ошибках HTTP.
+            NoResponseFromServerError: Если сервер не отвечает (выбрасывается внутри клиента).
+
+        Returns:
+            list[TokenBatchItem]: Результаты в порядке `tokens`: `TokenID` созданного токена или ошибка.
+        """  # noqa: E501
+        json_payload = [self._parse_token(token).model_dump(mode="json") for token in tokens]
+
+        rq = await self._wrapped_async_client.request(
+            request=self._build_json_request(
+                "POST",
+                self.base_url.join(self.version_api + "/tokens/batch"),
+                json_payload,
+            ),
+            requests_timeout=requests_timeout,
+            max_attempts=max_attempts,
+            base_retry_delay=base_retry_delay,
+        )
+
+        rq.raise_for_status()
+
+        return [TokenBatchItem(**item) for item in rq.json()]
+
+    @overload
+    async def get_token(
+        self,
+        token_id: TokenID | str,
+        requests_timeout: int | None = None,
+        max_attempts: int | None = None,
+        base_retry_delay: float | None = None,
+        *,
+        consume: bool | None = None,
+        fields: None = None,
+    ) -> Token: ...
+
+    @overload
     async def get_token(
         self,
         token_id: TokenID | str,
         requests_timeout: int | None = None,
         max_attempts: int | None = None,
         base_retry_delay: float | None = None,
-    ) -> Token:
+        *,
+        consume: bool | None = None,
+        fields: Sequence[str],
+    ) -> dict[str, Any]: ...
+
+    async def get_token(
+        self,
+        token_id: TokenID | str,
+        requests_timeout: int | None = None,
+        max_attempts: int | None = None,
+        base_retry_delay: float | None = None,
+        *,
+        consume: bool | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Token | dict[str, Any]:
         """Получает токен по идентификатору и возвращает объект `Token`.
 
         Args:
@@ -138,37 +263,157 @@ class PySGOConnect:
             requests_timeout (int | None, optional): Таймаут в секундах; по умолчанию берётся из настроек клиента.
             max_attempts (int | None, optional): Максимальное количество попыток запроса; по умолчанию из настроек.
             base_retry_delay (float | None, optional): Начальное время ожидания перед повторным запросом; по умолчанию из настроек.
+            consume (bool | None, optional): Удалить токен на сервере после чтения; по умолчанию решает сервер (`TOKEN_CONSUME_ON_READ`).
+                Если токен уже был получен и `consume` не равен True, запрос отправляется c `If-None-Match`, и при ответе
+                `304` токен берётся из хранилища валидаторов.
+            fields (Sequence[str] | None, optional): Вернуть только указанные поля токена, пути через точку
+                (например, `["refresh_token", "users.first_name"]`); для `refresh_token` и `time_to_refresh`
+                сервер не загружает пользователей.
 
         Raises:
             TypeError: Если `token_id` не является объектом `TokenID` или строкой.
-            TokenValidationError: Если сервер вернул ошибку валидации токена (HTTP 400).
-            TokenNotFoundError: Если токен c указанным ID не найден (HTTP 404).
+            TokenValidationError: Если сервер вернул ошибку валидации токена или неизвестное поле в `fields` (HTTP 400).
+            TokenNotFoundError: Если токен c указанным ID не найден (HTTP 404). При `consume` повторный запрос
+                после потерянного ответа тоже завершится этой ошибкой.
             HTTPStatusError: При других ошибках HTTP.
             NoResponseFromServerError: Если сервер не отвечает (выбрасывается внутри клиента).
 
         Returns:
-            Token: Pydantic-модель `Token` c данными токена.
+            Token | dict[str, Any]: Pydantic-модель `Token` c данными токена или, если задан `fields`, словарь c
+                выбранными полями.
         """  # noqa: E501
         if isinstance(token_id, TokenID):
             token_id = token_id.token_id
         elif not isinstance(token_id, str):  # type: ignore
             raise TypeError(f"Type {type(token_id)} not supported")
 
+        params: dict[str, str] = {}
+        if consume is not None:
+            params["consume"] = str(consume).lower()
+        if fields is not None:
+            params["fields"] = ",".join(fields)
+
+        key = (token_id, params.get("fields"))
+        validator = self._validators.get(key) if consume is not True else None
+
         try:
             rq = await self._wrapped_async_client.request(
                 self._wrapped_async_client.client.build_request(
                     method="GET",
                     url=self.base_url.join(self.version_api + f"/tokens/{token_id}"),
+                    params=params,
+                    headers={} if validator is None else {"if-none-match": validator[0]},
                 ),
                 requests_timeout=requests_timeout,
                 max_attempts=max_attempts,
                 base_retry_delay=base_retry_delay,
             )
+            if validator is not None and rq.status_code == codes.NOT_MODIFIED.value:
+                self._validators.move_to_end(key)
+                content = validator[1]
+            else:
+                rq.raise_for_status()
+                self._store_validator(key, rq)
+                content = rq.content
 
-            return Token(**rq.json())
+            return loads(content) if fields is not None else Token.model_validate_json(content)
         except HTTPStatusError as E:
             if E.response.status_code == codes.BAD_REQUEST.value:
                 raise TokenValidationError(**E.response.json()) from None
             if E.response.status_code == codes.NOT_FOUND.value:
+                self._drop_validators(token_id)
                 raise TokenNotFoundError(**E.response.json()) from None
             raise
+
+    async def check_token(
+        self,
+        token_id: TokenID | str,
+        requests_timeout: int | None = None,
+        max_attempts: int | None = None,
+        base_retry_delay: float | None = None,
+    ) -> datetime | None:
+        """Проверяет, действителен ли токен, запросом `HEAD` без загрузки самого токена.
+
+        Args:
+            token_id (TokenID | str): Идентификатор токена в виде Pydantic модели `TokenID` или строки `UUID`.
+            requests_timeout (int | None, optional): Таймаут в секундах; по умолчанию берётся из настроек клиента.
+            max_attempts (int | None, optional): Максимальное количество попыток запроса; по умолчанию из настроек.
+            base_retry_delay (float | None, optional): Начальное время ожидания перед повторным запросом; по умолчанию из настроек.
+
+        Raises:
+            TypeError: Если `token_id` не является объектом `TokenID` или строкой.
+            HTTPStatusError: При ошибках HTTP, кроме 404 (например, 400 при некорректном ID).
+            NoResponseFromServerError: Если сервер не отвечает (выбрасывается внутри клиента).
+
+        Returns:
+            datetime | None: Время истечения токена c точностью до секунды или None, если токен не найден или истёк.
+        """  # noqa: E501
+        if isinstance(token_id, TokenID):
+            token_id = token_id.token_id
+        elif not isinstance(token_id, str):  # type: ignore
+            raise TypeError(f"Type {type(token_id)} not supported")
+
+        rq = await self._wrapped_async_client.request(
+            self._wrapped_async_client.client.build_request(
+                method="HEAD",
+                url=self.base_url.join(self.version_api + f"/tokens/{token_id}"),
+            ),
+            requests_timeout=requests_timeout,
+            max_attempts=max_attempts,
+            base_retry_delay=base_retry_delay,
+        )
+
+        if rq.status_code == codes.NOT_FOUND.value:
+            self._drop_validators(token_id)
+            return None
+
+        rq.raise_for_status()
+
+        return parsedate_to_datetime(rq.headers["expires"])
+
+    async def get_tokens(
+        self,
+        token_ids: Sequence[TokenID | str],
+        requests_timeout: int | None = None,
+        max_attempts: int | None = None,
+        base_retry_delay: float | None = None,
+    ) -> TokenLookupResult:
+        """Получает несколько токенов одним запросом.
+
+        Args:
+            token_ids (Sequence[TokenID | str]): Идентификаторы токенов в виде Pydantic моделей `TokenID` или строк `UUID`.
+            requests_timeout (int | None, optional): Таймаут в секундах; по умолчанию берётся из настроек клиента.
+            max_attempts (int | None, optional): Максимальное количество попыток запроса; по умолчанию из настроек.
+            base_retry_delay (float | None, optional): Начальное время ожидания перед повторным запросом; по умолчанию из настроек.
+
+        Raises:
+            TypeError: Если один из `token_ids` не является объектом `TokenID` или строкой.
+            HTTPStatusError: При ошибках HTTP.
+            NoResponseFromServerError: Если сервер не отвечает (выбрасывается внутри клиента).
+
+        Returns:
+            TokenLookupResult: Найденные токены по ID, a также ненайденные и некорректные ID.
+        """  # noqa: E501
+        json_payload: list[str] = []
+        for token_id in token_ids:
+            if isinstance(token_id, TokenID):
+                json_payload.append(token_id.token_id)
+            elif isinstance(token_id, str):  # type: ignore
+                json_payload.append(token_id)
+            else:
+                raise TypeError(f"Type {type(token_id)} not supported")
+
+        rq = await self._wrapped_async_client.request(
+            self._build_json_request(
+                "POST",
+                self.base_url.join(self.version_api + "/tokens/lookup"),
+                json_payload,
+            ),
+            requests_timeout=requests_timeout,
+            max_attempts=max_attempts,
+            base_retry_delay=base_retry_delay,
+        )
+
+        rq.raise_for_status()
+
+        return TokenLookupResult(**rq.json())
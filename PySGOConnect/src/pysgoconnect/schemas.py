@@ -4,6 +4,8 @@ from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
 
+from pysgoconnect.errors import BaseErrorSchema
+
 
 class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -67,3 +69,14 @@ class TokenID(BaseSchema):
         ...,
         description="Token expiration time in seconds",
     )
+
+
+class TokenBatchItem(BaseSchema):
+    token_id: TokenID | None = Field(None, description="Created token, if the item succeeded")
+    error: BaseErrorSchema | None = Field(None, description="Item error, if the item failed")
+
+
+class TokenLookupResult(BaseSchema):
+    tokens: dict[str, Token] = Field(default_factory=dict[str, Token], description="Found tokens by token ID")
+    not_found: list[str] = Field(default_factory=list[str], description="Token IDs not found or expired")
+    invalid: list[str] = Field(default_factory=list[str], description="Malformed token IDs")
@@ -0,0 +1,88 @@
+from collections.abc import Awaitable
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from statistics import mean
+from statistics import quantiles
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.schemas.token import Token as TokenSchema
+
+
+def make_token(users: int, children: int, organizations: int, classes: int) -> TokenSchema:
+    def organization_info(index: int) -> dict[str, Any]:
+        return {
+            "is_active": True,
+            "classes": [{"class_id": class_id, "class_name": f"{class_id + 1}A"} for class_id in range(classes)],
+            "organization": {"organization_id": index, "is_add_school": False, "name": f"School #{index}"},
+        }
+
+    def person(index: int, id_key: str) -> dict[str, Any]:
+        return {
+            id_key: index,
+            "first_name": "Ivan",
+            "nick_name": "ivan",
+            "login_name": f"ivan{index}",
+            "is_parent": id_key == "user_id",
+            "is_staff": False,
+            "is_student": id_key == "child_id",
+            "organizations": [organization_info(i) for i in range(organizations)],
+        }
+
+    return TokenSchema.model_validate(
+        {
+            "refresh_token": "r" * 2048,
+            "time_to_refresh": datetime.now(UTC) + timedelta(hours=1),
+            "users": [
+                {
+                    **person(user, "user_id"),
+                    "children": [person(users + user * children + child, "child_id") for child in range(children)],
+                }
+                for user in range(users)
+            ],
+        },
+    )
+
+
+@dataclass
+class StatementCounter:
+    """Counts statements and fetched rows on an engine while ``active`` is set."""
+
+    engine: AsyncEngine
+    statements: int = 0
+    rows: int = 0
+    active: bool = field(default=False, repr=False)
+
+    def __post_init__(self) -> None:
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, *args: Any) -> None:  # noqa: ARG002
+        if self.active:
+            self.statements += 1
+            self.rows += max(cursor.rowcount, 0)
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.rows = 0
+
+
+async def measure(func: Callable[[], Awaitable[Any]], iterations: int) -> dict[str, float]:
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = perf_counter()
+        await func()
+        timings.append((perf_counter() - start) * 1000)
+
+    percentiles = quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    return {
+        "mean_ms": round(mean(timings), 3),
+        "p50_ms": round(percentiles[49], 3),
+        "p99_ms": round(percentiles[98], 3),
+    }
@@ -0,0 +1,106 @@
+"""Token data access benchmark: ORM vs. asyncpg fast path.
+
+Runs every hot repository operation (single create, batch create, single read,
+batch read, consume) through ``TokenCRUD`` and through ``AsyncpgTokenRepository``
+against the PostgreSQL database configured in ``Settings`` and reports the
+latency of both paths side by side.
+
+Usage:
+    python -m benchmarks.data_access --batch 50 --iterations 200
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Callable
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from itertools import cycle
+from typing import Any
+
+from benchmarks.common import make_token
+from benchmarks.common import measure
+from src.core.config import TokenStorageMode
+from src.core.config import settings
+from src.core.database import database
+from src.core.database import setup_database
+from src.repositories.base import TokenRepository
+from src.repositories.postgres import AsyncpgTokenRepository
+from src.services.tokens import TokenCRUD
+
+
+def orm(session: Any) -> TokenRepository:
+    return TokenCRUD(session)
+
+
+def asyncpg(session: Any) -> TokenRepository:
+    return AsyncpgTokenRepository(TokenCRUD(session))
+
+
+async def run(
+    args: argparse.Namespace,
+    factory: Callable[[Any], TokenRepository],
+) -> dict[str, dict[str, float]]:
+    token = make_token(args.users, args.children, args.organizations, args.classes)
+    expires_at = datetime.now(UTC) + timedelta(seconds=settings.TOKEN_EXPIRES_SECONDS)
+    token_ids: list[int] = []
+
+    def operation(call: Callable[[TokenRepository], Awaitable[Any]]) -> Callable[[], Awaitable[None]]:
+        async def func() -> None:
+            async with database.session_factory() as session:
+                await call(factory(session))
+
+        return func
+
+    async def create(repository: TokenRepository) -> None:
+        token_ids.extend(await repository.create_tokens([token], expires_at))
+
+    results = {
+        "create": await measure(operation(create), args.iterations),
+        "create_batch": await measure(
+            operation(lambda repository: repository.create_tokens([token] * args.batch, expires_at)),
+            args.iterations,
+        ),
+    }
+
+    ids = cycle(token_ids)
+    results["get_token"] = await measure(operation(lambda repository: repository.get_token(next(ids))), args.iterations)
+    results["get_tokens"] = await measure(
+        operation(lambda repository: repository.get_tokens([next(ids) for _ in range(args.batch)])),
+        args.iterations,
+    )
+
+    consumable = iter(token_ids)
+    results["consume_token"] = await measure(
+        operation(lambda repository: repository.consume_token(next(consumable))),
+        args.iterations,
+    )
+
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings.TOKEN_STORAGE_MODE = TokenStorageMode(args.mode)
+    await setup_database()
+
+    paths = {"orm": await run(args, orm), "asyncpg": await run(args, asyncpg)}
+
+    for name in paths["orm"]:
+        for path, results in paths.items():
+            print(f"{name:>13} {path:>7}: {results[name]}")
+        print(f"{name:>13} speedup: x{paths['orm'][name]['p50_ms'] / paths['asyncpg'][name]['p50_ms']:.2f}")
+
+    await database.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=[mode.value for mode in TokenStorageMode], default="normalized")
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--children", type=int, default=2)
+    parser.add_argument("--organizations", type=int, default=2)
+    parser.add_argument("--classes", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+"""Row conversion microbenchmark: validated tokens into insert rows, without a database.
+
+Compares the conversions a token goes through before it is inserted:
+
+- ``orm_objects``: ``pydantic_to_sqlalchemy``, i.e. ``model_dump`` and the nested
+  declarative constructor building ORM objects.
+- ``model_dump``: one ``model_dump`` per nested object, as the bulk insert did before
+  the precompiled converter.
+- ``compiled_dicts`` / ``compiled_records``: ``token_rows`` producing the dict rows of
+  the ORM repository and the tuples of the asyncpg repository.
+
+Usage:
+    python -m benchmarks.row_conversion --users 20 --children 3 --organizations 3 --classes 10 --batch 10
+"""
+
+import argparse
+from collections.abc import Callable
+from collections.abc import Sequence
+from itertools import count
+from statistics import mean
+from statistics import quantiles
+from time import perf_counter
+from typing import Any
+
+from benchmarks.common import make_token
+from src.models.token import Token as TokenModel
+from src.repositories.rows import token_rows
+from src.schemas.token import OrganizationInfo as OrganizationInfoSchema
+from src.schemas.token import Token as TokenSchema
+from src.utils.utils import pydantic_to_sqlalchemy
+
+
+def orm_objects(tokens: Sequence[TokenSchema]) -> None:
+    for token in tokens:
+        pydantic_to_sqlalchemy(token, TokenModel)
+
+
+def model_dump_rows(tokens: Sequence[TokenSchema]) -> None:
+    ids = count()
+
+    def organization_rows(owner_key: str, organizations: list[tuple[int, OrganizationInfoSchema]]) -> None:
+        info_ids = [next(ids) for _ in organizations]
+        [{"is_active": info.is_active, owner_key: owner_id} for owner_id, info in organizations]
+        [
+            {**info.organization.model_dump(), "organization_info_id": info_id}
+            for info_id, (_, info) in zip(info_ids, organizations, strict=True)
+        ]
+        [
+            {**class_.model_dump(), "organization_info_id": info_id}
+            for info_id, (_, info) in zip(info_ids, organizations, strict=True)
+            for class_ in info.classes
+        ]
+
+    users = [(next(ids), user) for token in tokens for user in token.users]
+    [{**user.model_dump(exclude={"organizations", "children"}), "token_id": token_id} for token_id, user in users]
+    user_ids = [next(ids) for _ in users]
+
+    children = [
+        (user_id, child) for user_id, (_, user) in zip(user_ids, users, strict=True) for child in user.children or []
+    ]
+    [{**child.model_dump(exclude={"organizations"}), "user_id": user_id} for user_id, child in children]
+    child_ids = [next(ids) for _ in children]
+
+    organization_rows(
+        "user_id",
+        [
+            (user_id, organization)
+            for user_id, (_, user) in zip(user_ids, users, strict=True)
+            for organization in user.organizations
+        ],
+    )
+    organization_rows(
+        "child_id",
+        [
+            (child_id, organization)
+            for child_id, (_, child) in zip(child_ids, children, strict=True)
+            for organization in child.organizations
+        ],
+    )
+
+
+def compiled(tokens: Sequence[TokenSchema], *, records: bool) -> None:
+    tables = token_rows.convert(tokens)
+    tables[0].ids = list(range(len(tokens)))
+
+    for table in tables[1:]:
+        rows: list[Any] = table.records() if records else table.rows()
+        table.ids = list(range(len(rows)))
+
+
+def measure(func: Callable[[], None], iterations: int) -> str:
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = perf_counter()
+        func()
+        timings.append((perf_counter() - start) * 1000)
+
+    percentiles = quantiles(timings, n=100)
+    return f"mean_ms={mean(timings):.3f} p50_ms={percentiles[49]:.3f} p99_ms={percentiles[98]:.3f}"
+
+
+def main(args: argparse.Namespace) -> None:
+    tokens = [make_token(args.users, args.children, args.organizations, args.classes)] * args.batch
+    rows = sum(len(table.items) for table in token_rows.convert(tokens))
+    print(f"tokens={len(tokens)} rows={rows}")
+
+    conversions: dict[str, Callable[[], None]] = {
+        "orm_objects": lambda: orm_objects(tokens),
+        "model_dump": lambda: model_dump_rows(tokens),
+        "compiled_dicts": lambda: compiled(tokens, records=False),
+        "compiled_records": lambda: compiled(tokens, records=True),
+    }
+    for name, conversion in conversions.items():
+        print(f"{name:>16}: {measure(conversion, args.iterations)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--children", type=int, default=3)
+    parser.add_argument("--organizations", type=int, default=3)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,83 @@
+"""Token schema benchmark: insert and lookup latency plus index footprint.
+
+Runs against the database configured in ``Settings`` using the normalized
+storage mode. Run it once on a database created by the old schema and once
+after the migration in ``src.core.migrations`` to compare both layouts.
+
+Usage:
+    python -m benchmarks.schema --batch 50 --iterations 50
+"""
+
+import argparse
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from itertools import cycle
+
+from sqlalchemy import select
+from sqlalchemy import text
+
+from benchmarks.common import make_token
+from benchmarks.common import measure
+from src.core.config import TokenStorageMode
+from src.core.config import settings
+from src.core.database import database
+from src.core.database import setup_database
+from src.models.token import Token as TokenModel
+from src.services.tokens import TokenCRUD
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings.TOKEN_STORAGE_MODE = TokenStorageMode.NORMALIZED
+    await setup_database()
+
+    tokens = [make_token(args.users, args.children, args.organizations, args.classes)] * args.batch
+    expires_at = datetime.now(UTC) + timedelta(seconds=settings.TOKEN_EXPIRES_SECONDS)
+    token_ids: list[int] = []
+
+    async def insert() -> None:
+        async with database.session_factory() as session:
+            token_ids.extend(await TokenCRUD(session).create_tokens(tokens, expires_at))
+
+    print(f"   insert: batch={args.batch} {await measure(insert, args.iterations)}")
+
+    ids = cycle(token_ids)
+
+    async def get_graph() -> None:
+        async with database.session_factory() as session:
+            (await session.scalars(select(TokenModel).where(TokenModel.id == next(ids)))).first()
+
+    async def get_token() -> None:
+        async with database.session_factory() as session:
+            await TokenCRUD(session).get_token(next(ids))
+
+    print(f"get_graph: {await measure(get_graph, args.iterations)}")
+    print(f"get_token: {await measure(get_token, args.iterations)}")
+
+    async with database.engine.connect() as conn:
+        indexes = (
+            await conn.execute(
+                text(
+                    "SELECT tablename, count(*) AS indexes, "
+                    "sum(pg_relation_size(quote_ident(indexname)::regclass)) AS size "
+                    "FROM pg_indexes WHERE schemaname = 'public' GROUP BY tablename ORDER BY tablename",
+                ),
+            )
+        ).all()
+
+    for row in indexes:
+        print(f"{row.tablename:>28}: indexes={row.indexes} size_bytes={row.size}")
+
+    await database.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--children", type=int, default=2)
+    parser.add_argument("--organizations", type=int, default=2)
+    parser.add_argument("--classes", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,147 @@
+"""ASGI server benchmark: token endpoints on every ``SERVER_RUNTIME``.
+
+Starts ``python -m src.core.server`` once per runtime with the environment of this
+process, drives ``POST /v1/tokens/`` and then ``GET /v1/tokens/{id}`` with
+``--concurrency`` keep-alive clients and reports throughput and latency of both.
+Runtimes whose server is not installed are skipped. ``--http2`` sends requests
+as HTTP/2 with prior knowledge (h2c), which uvicorn does not support.
+
+Usage:
+    python -m benchmarks.server_runtime --runtimes uvicorn uvicorn-asyncio granian hypercorn --requests 5000
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Awaitable
+from collections.abc import Callable
+from itertools import cycle
+from os import environ
+from statistics import quantiles
+from time import perf_counter
+
+import httpx
+
+from benchmarks.common import make_token
+from src.core.config import ServerRuntime
+from src.core.server import RUNNERS
+from src.core.server import is_installed
+
+SERVER_MODULES = {
+    ServerRuntime.UVICORN: "uvicorn",
+    ServerRuntime.UVICORN_ASYNCIO: "uvicorn",
+    ServerRuntime.GRANIAN: "granian",
+    ServerRuntime.HYPERCORN: "hypercorn",
+}
+
+
+async def wait_ready(client: httpx.AsyncClient, server: asyncio.subprocess.Process, startup_seconds: float) -> None:
+    deadline = perf_counter() + startup_seconds
+    while perf_counter() < deadline:
+        if server.returncode is not None:
+            msg = f"Server exited with code {server.returncode}"
+            raise RuntimeError(msg)
+        try:
+            await client.get("/v1/metrics/")
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+        else:
+            return
+
+    msg = "Server did not start in time"
+    raise RuntimeError(msg)
+
+
+async def load(requests: int, concurrency: int, send: Callable[[], Awaitable[httpx.Response]]) -> str:
+    timings: list[float] = []
+    failures = 0
+
+    async def worker(count: int) -> None:
+        nonlocal failures
+        for _ in range(count):
+            start = perf_counter()
+            try:
+                response = await send()
+            except httpx.TransportError:
+                failures += 1
+                continue
+            timings.append((perf_counter() - start) * 1000)
+            failures += response.is_error
+
+    start = perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+
+    percentiles = quantiles(timings, n=100)
+    return (
+        f"rps={len(timings) / elapsed:.0f} p50_ms={percentiles[49]:.2f} p99_ms={percentiles[98]:.2f} "
+        f"failures={failures}"
+    )
+
+
+async def bench(args: argparse.Namespace, runtime: ServerRuntime) -> None:
+    env = {**environ, "SERVER_RUNTIME": runtime.value, "WORKERS": str(args.workers), "PORT": str(args.port)}
+    server = await asyncio.create_subprocess_exec(sys.executable, "-m", "src.core.server", env=env)
+
+    payload = make_token(args.users, args.children, args.organizations, args.classes).model_dump(mode="json")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}",
+            http1=not args.http2,
+            http2=args.http2,
+            limits=limits,
+            timeout=30,
+        ) as client:
+            await wait_ready(client, server, args.startup_timeout)
+
+            token_ids: list[str] = []
+
+            async def create() -> httpx.Response:
+                response = await client.post("/v1/tokens/", json=payload)
+                if response.is_success:
+                    token_ids.append(response.json()["token_id"])
+                return response
+
+            print(f"{runtime.value:>16} create: {await load(args.requests, args.concurrency, create)}")
+
+            ids = cycle(token_ids)
+            read = await load(args.requests, args.concurrency, lambda: client.get(f"/v1/tokens/{next(ids)}"))
+            print(f"{runtime.value:>16}    get: {read}")
+    finally:
+        server.terminate()
+        await server.wait()
+
+
+async def main(args: argparse.Namespace) -> None:
+    for runtime in map(ServerRuntime, args.runtimes):
+        if not is_installed(SERVER_MODULES[runtime]):
+            print(f"{runtime.value:>16}: not installed")
+            continue
+        if args.http2 and runtime in {ServerRuntime.UVICORN, ServerRuntime.UVICORN_ASYNCIO}:
+            print(f"{runtime.value:>16}: no HTTP/2 support")
+            continue
+
+        await bench(args, runtime)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--runtimes",
+        nargs="+",
+        choices=[runtime.value for runtime in RUNNERS],
+        default=[runtime.value for runtime in RUNNERS],
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--http2", action="store_true")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--children", type=int, default=1)
+    parser.add_argument("--organizations", type=int, default=1)
+    parser.add_argument("--classes", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--startup-timeout", type=float, default=30)
+    asyncio.run(main(parser.parse_args()))
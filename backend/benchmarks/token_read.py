@@ -0,0 +1,100 @@
+"""Token read path benchmark: joined eager loading vs. per-level selectin loading.
+
+Runs against the database configured in ``Settings`` and reports, per strategy,
+the number of statements, the number of rows fetched from the server and the
+latency of loading one token.
+
+Usage:
+    python -m benchmarks.token_read --users 4 --children 3 --organizations 3 --classes 10
+"""
+
+import argparse
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import StatementCounter
+from benchmarks.common import make_token
+from benchmarks.common import measure
+from src.core.config import TokenStorageMode
+from src.core.config import settings
+from src.core.database import database
+from src.core.database import setup_database
+from src.models.token import Child as ChildModel
+from src.models.token import OrganizationInfoChild as OrganizationInfoChildModel
+from src.models.token import OrganizationInfoUser as OrganizationInfoUserModel
+from src.models.token import Token as TokenModel
+from src.models.token import User as UserModel
+from src.schemas.token import Token as TokenSchema
+from src.services.tokens import TokenCRUD
+
+
+def loader_options(loader):  # type: ignore
+    return (
+        loader(TokenModel.users).options(
+            loader(UserModel.organizations).options(
+                loader(OrganizationInfoUserModel.classes),
+                loader(OrganizationInfoUserModel.organization),
+            ),
+            loader(UserModel.children).options(
+                loader(ChildModel.organizations).options(
+                    loader(OrganizationInfoChildModel.classes),
+                    loader(OrganizationInfoChildModel.organization),
+                ),
+            ),
+        ),
+    )
+
+
+STRATEGIES = {
+    "joined": loader_options(joinedload),
+    "selectin": loader_options(selectinload),
+}
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings.TOKEN_STORAGE_MODE = TokenStorageMode.NORMALIZED
+    await setup_database()
+
+    token = make_token(args.users, args.children, args.organizations, args.classes)
+    expires_at = datetime.now(UTC) + timedelta(seconds=settings.TOKEN_EXPIRES_SECONDS)
+    async with database.session_factory() as session:
+        (token_id,) = await TokenCRUD(session).create_tokens([token], expires_at)
+
+    counter = StatementCounter(database.engine)
+
+    for name, options in STRATEGIES.items():
+
+        async def load(options=options) -> None:  # type: ignore
+            async with database.session_factory() as session:
+                token_model = (
+                    (await session.scalars(select(TokenModel).where(TokenModel.id == token_id).options(*options)))
+                    .unique()
+                    .one()
+                )
+                TokenSchema.model_validate(token_model)
+
+        counter.reset()
+        counter.active = True
+        await load()
+        counter.active = False
+
+        timings = await measure(load, args.iterations)
+        print(f"{name:>9}: statements={counter.statements} rows={counter.rows} {timings}")
+
+    await database.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--children", type=int, default=3)
+    parser.add_argument("--organizations", type=int, default=3)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""Token write path benchmark: one commit per create vs. group commit.
+
+Runs ``--concurrency`` workers that create single tokens against the database
+configured in ``Settings`` and reports the throughput and latency of a create,
+once with a commit per token and once through ``TokenWriteBuffer`` in both
+durability modes.
+
+Usage:
+    python -m benchmarks.token_write --concurrency 64 --tokens 4000
+"""
+
+import argparse
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from statistics import quantiles
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from benchmarks.common import make_token
+from src.core.config import WriteDurability
+from src.core.config import settings
+from src.core.database import database
+from src.core.database import setup_database
+from src.services.tokens import TokenCRUD
+from src.services.write_buffer import BufferedTokenRepository
+from src.services.write_buffer import TokenWriteBuffer
+
+if TYPE_CHECKING:
+    from src.repositories.base import TokenRepository
+
+
+async def run(args: argparse.Namespace, buffer: TokenWriteBuffer | None) -> str:
+    token = make_token(args.users, args.children, args.organizations, args.classes)
+    timings: list[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            start = perf_counter()
+            async with database.session_factory() as session:
+                repository: TokenRepository = TokenCRUD(session)
+                if buffer is not None:
+                    repository = BufferedTokenRepository(repository, buffer)
+                expires_at = datetime.now(UTC) + timedelta(seconds=settings.TOKEN_EXPIRES_SECONDS)
+                await repository.create_tokens([token], expires_at)
+            timings.append((perf_counter() - start) * 1000)
+
+    start = perf_counter()
+    await asyncio.gather(*(worker(args.tokens // args.concurrency) for _ in range(args.concurrency)))
+    elapsed = perf_counter() - start
+
+    percentiles = quantiles(timings, n=100)
+    return f"tokens/s={len(timings) / elapsed:.0f} p50_ms={percentiles[49]:.2f} p99_ms={percentiles[98]:.2f}"
+
+
+async def main(args: argparse.Namespace) -> None:
+    await setup_database()
+
+    print(f"        per-commit: {await run(args, None)}")
+    for durability in WriteDurability:
+        buffer = TokenWriteBuffer(args.max_delay_ms, args.max_batch, durability)
+        print(f"{'buffer ' + durability.value:>18}: {await run(args, buffer)} batches={buffer.batches}")
+
+    await database.close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--children", type=int, default=1)
+    parser.add_argument("--organizations", type=int, default=1)
+    parser.add_argument("--classes", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--tokens", type=int, default=4000)
+    parser.add_argument("--max-delay-ms", type=float, default=settings.TOKEN_WRITE_BUFFER_MAX_DELAY_MS)
+    parser.add_argument("--max-batch", type=int, default=settings.TOKEN_WRITE_BUFFER_MAX_BATCH)
+    asyncio.run(main(parser.parse_args()))
@@ -1,7 +1,11 @@
 from enum import Enum
 from hashlib import sha256 as hashlib_sha256
+from importlib.util import find_spec
+from os import cpu_count
 
+from pydantic import Field
 from pydantic import computed_field
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 _PROJECT_NAME = "SGO Connect"
@@ -25,6 +29,48 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+class ServerRuntime(str, Enum):
+    UVICORN = "uvicorn"
+    UVICORN_ASYNCIO = "uvicorn-asyncio"
+    GRANIAN = "granian"
+    HYPERCORN = "hypercorn"
+
+
+class ContentEncoding(str, Enum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class DatabaseEngine(str, Enum):
+    POSTGRESQL = "postgresql"
+    SQLITE = "sqlite"
+
+
+class DatabasePooling(str, Enum):
+    QUEUE = "queue"
+    NULL = "null"
+
+
+class TokenStorageBackend(str, Enum):
+    DATABASE = "database"
+    MEMORY = "memory"
+
+
+class TokenDataAccess(str, Enum):
+    ORM = "orm"
+    ASYNCPG = "asyncpg"
+
+
+class WriteDurability(str, Enum):
+    DURABLE = "durable"
+    RELAXED = "relaxed"
+
+
+class TokenStorageMode(str, Enum):
+    NORMALIZED = "normalized"
+    DOCUMENT = "document"
+
+
 no = {
     LogLevel.TRACE: 5,
     LogLevel.DEBUG: 10,
@@ -55,6 +101,8 @@ class Settings(BaseSettings):
     @computed_field
     @property
     def DATABASE_URL(self) -> str:  # noqa: N802
+        if self.DATABASE_ENGINE is DatabaseEngine.SQLITE:
+            return f"sqlite+aiosqlite:///{self.SQLITE_PATH}"
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
     ENVIRONMENT: Environment = Environment.DEVELOPMENT
@@ -62,15 +110,142 @@ class Settings(BaseSettings):
     ENABLE_CONSOLE: bool = True
     ENABLE_JSON: bool = False
     PORT: int
+    HOST: str = "0.0.0.0"  # noqa: S104
+    WORKERS: int = Field(default_factory=lambda: cpu_count() or 1, ge=1)
+    SERVER_RUNTIME: ServerRuntime = ServerRuntime.UVICORN
+    SERVER_BACKLOG: int = 2048
+    SERVER_LIMIT_CONCURRENCY: int | None = None
+    SERVER_TIMEOUT_KEEP_ALIVE: int = 5
+    SERVER_TIMEOUT_GRACEFUL_SHUTDOWN: int = 30
+    COMPRESSION_ENCODINGS: list[ContentEncoding] = [ContentEncoding.GZIP]
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, ge=1, le=9)
+    COMPRESSION_ZSTD_LEVEL: int = Field(default=3, ge=1, le=22)
+    REQUEST_MAX_DECOMPRESSED_BYTES: int = 32 * 1024 * 1024  # 32 MiB
     TOKEN_EXPIRES_SECONDS: int = 5 * 60  # 5 minutes
+    TOKEN_STORAGE_BACKEND: TokenStorageBackend = TokenStorageBackend.DATABASE
+    TOKEN_STORAGE_MODE: TokenStorageMode = TokenStorageMode.NORMALIZED
+    TOKEN_DATA_ACCESS: TokenDataAccess = TokenDataAccess.ORM
+    TOKEN_MEMORY_SHARDS: int = 16
+    TOKEN_MEMORY_WHEEL_RESOLUTION_SECONDS: float = 1
+    TOKEN_CONSUME_ON_READ: bool = False
+    TOKEN_REAPER_ENABLED: bool = True
+    TOKEN_REAPER_INTERVAL_SECONDS: float = 60
+    TOKEN_REAPER_BATCH_SIZE: int = 1000
+    TOKEN_PARTITIONING_ENABLED: bool = False
+    TOKEN_PARTITION_INTERVAL_SECONDS: int = 60 * 60  # 1 hour
+    TOKEN_PARTITION_PRECREATE: int = 3
+    TOKEN_PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 60
+    TOKEN_BATCH_MAX_SIZE: int = 1000
+    TOKEN_WRITE_BUFFER_ENABLED: bool = False
+    TOKEN_WRITE_BUFFER_MAX_DELAY_MS: float = 5
+    TOKEN_WRITE_BUFFER_MAX_BATCH: int = 500
+    TOKEN_WRITE_BUFFER_DURABILITY: WriteDurability = WriteDurability.DURABLE
+    TOKEN_CACHE_ENABLED: bool = False
+    TOKEN_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MiB
+    TOKEN_CACHE_MAX_AGE_SECONDS: int = 0  # 0 - until the token expires
+    TOKEN_CACHE_STALE_IF_ERROR: bool = False
     SECRET_KEY: str
     SALT: bytes
-    POSTGRES_USER: str
-    POSTGRES_PASSWORD: str
-    POSTGRES_HOST: str
-    POSTGRES_PORT: int
-    POSTGRES_DB: str
+    DATABASE_ENGINE: DatabaseEngine = DatabaseEngine.POSTGRESQL
+    POSTGRES_USER: str | None = None
+    POSTGRES_PASSWORD: str | None = None
+    POSTGRES_HOST: str | None = None
+    POSTGRES_PORT: int | None = None
+    POSTGRES_DB: str | None = None
+    SQLITE_PATH: str = "sgo_connect.db"
+    DATABASE_POOLING: DatabasePooling = DatabasePooling.QUEUE
     DATABASE_POOL_SIZE: int = 32
+    DATABASE_POOL_MAX_OVERFLOW: int = 8
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 1
+    DATABASE_REPLICA_CHECK_INTERVAL_SECONDS: float = 5
+
+    @model_validator(mode="after")
+    def check_database_engine(self) -> "Settings":
+        if self.DATABASE_ENGINE is not DatabaseEngine.POSTGRESQL:
+            return self
+
+        missing = [
+            name
+            for name in ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST", "POSTGRES_PORT", "POSTGRES_DB")
+            if getattr(self, name) is None
+        ]
+        if missing:
+            msg = f"DATABASE_ENGINE=postgresql requires {', '.join(missing)}"
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def check_workers(self) -> "Settings":
+        # Tokens of the memory backend, the SQLite write lock and the token cache are
+        # per process; a token consumed on one worker would stay cached on the others
+        if self.TOKEN_STORAGE_BACKEND is TokenStorageBackend.MEMORY:
+            reason = "TOKEN_STORAGE_BACKEND=memory"
+        elif self.DATABASE_ENGINE is DatabaseEngine.SQLITE:
+            reason = "DATABASE_ENGINE=sqlite"
+        elif self.TOKEN_CACHE_ENABLED:
+            reason = "TOKEN_CACHE_ENABLED"
+        else:
+            return self
+
+        if "WORKERS" not in self.model_fields_set:
+            self.WORKERS = 1
+        elif self.WORKERS > 1:
+            msg = f"{reason} supports a single worker process, set WORKERS=1"
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def check_compression(self) -> "Settings":
+        if ContentEncoding.ZSTD in self.COMPRESSION_ENCODINGS and find_spec("zstandard") is None:
+            msg = "COMPRESSION_ENCODINGS=zstd requires the zstd extra (zstandard)"
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def check_token_partitioning(self) -> "Settings":
+        if not self.TOKEN_PARTITIONING_ENABLED:
+            return self
+
+        if self.TOKEN_STORAGE_BACKEND is not TokenStorageBackend.DATABASE:
+            msg = "TOKEN_PARTITIONING_ENABLED requires TOKEN_STORAGE_BACKEND=database"
+            raise ValueError(msg)
+        if self.DATABASE_ENGINE is not DatabaseEngine.POSTGRESQL:
+            msg = "TOKEN_PARTITIONING_ENABLED requires DATABASE_ENGINE=postgresql"
+            raise ValueError(msg)
+        if self.TOKEN_STORAGE_MODE is not TokenStorageMode.DOCUMENT:
+            msg = "TOKEN_PARTITIONING_ENABLED requires TOKEN_STORAGE_MODE=document"
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def check_token_data_access(self) -> "Settings":
+        if self.TOKEN_DATA_ACCESS is not TokenDataAccess.ASYNCPG:
+            return self
+
+        if self.TOKEN_STORAGE_BACKEND is not TokenStorageBackend.DATABASE:
+            msg = "TOKEN_DATA_ACCESS=asyncpg requires TOKEN_STORAGE_BACKEND=database"
+            raise ValueError(msg)
+        if self.DATABASE_ENGINE is not DatabaseEngine.POSTGRESQL:
+            msg = "TOKEN_DATA_ACCESS=asyncpg requires DATABASE_ENGINE=postgresql"
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def check_database_replicas(self) -> "Settings":
+        if not self.DATABASE_REPLICA_URLS:
+            return self
+
+        if self.TOKEN_STORAGE_BACKEND is not TokenStorageBackend.DATABASE:
+            msg = "DATABASE_REPLICA_URLS requires TOKEN_STORAGE_BACKEND=database"
+            raise ValueError(msg)
+        if self.DATABASE_ENGINE is not DatabaseEngine.POSTGRESQL:
+            msg = "DATABASE_REPLICA_URLS requires DATABASE_ENGINE=postgresql"
+            raise ValueError(msg)
+        return self
 
 
 settings = Settings()  # type: ignore
@@ -1,8 +1,22 @@
+from asyncio import Lock
+from contextlib import AbstractAsyncContextManager
+from contextlib import nullcontext
+from datetime import UTC
 from datetime import datetime
 from typing import Any
+from typing import ClassVar
 
+from asyncpg import InterfaceError
+from asyncpg import PostgresError
+from sqlalchemy import DateTime
+from sqlalchemy import Dialect
 from sqlalchemy import Integer
+from sqlalchemy import TypeDecorator
+from sqlalchemy import event
 from sqlalchemy import func
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
@@ -11,7 +25,20 @@ from sqlalchemy.orm import class_mapper
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import mapped_column
 
+from src.core.config import DatabaseEngine
 from src.core.config import settings
+from src.core.migrations import SCHEMA_MIGRATIONS
+from src.core.partitions import TOKENS_TABLE
+from src.core.partitions import create_partitions
+from src.core.partitions import is_partitioned
+from src.core.pool import pool_options
+
+# Key of the PostgreSQL advisory lock taken by ``Database.lock_schema``
+SCHEMA_LOCK_KEY = 0x53474F43
+
+# Failures of a database or of the connection to it, raised through SQLAlchemy or
+# directly by asyncpg on the asyncpg data access path
+DATABASE_ERRORS = (SQLAlchemyError, OSError, PostgresError, InterfaceError)
 
 
 def declarative_nested_model_constructor(self: Any, **kwargs: Any) -> None:
@@ -42,26 +69,78 @@ def declarative_nested_model_constructor(self: Any, **kwargs: Any) -> None:
             setattr(self, key, value)
 
 
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+)
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:  # noqa: ARG001
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+class UTCDateTime(TypeDecorator[datetime]):
+    """Timezone-aware datetime normalized to UTC.
+
+    SQLite has no time zone support, so values are converted to UTC before they
+    are stored and read back as UTC; on PostgreSQL this is a plain ``timestamptz``.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value: datetime | None, dialect: Dialect) -> datetime | None:  # noqa: ARG002
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value.astimezone(UTC)
+
+    def process_result_value(self, value: datetime | None, dialect: Dialect) -> datetime | None:  # noqa: ARG002
+        if value is None or value.tzinfo is not None:
+            return value
+        return value.replace(tzinfo=UTC)
+
+
 class Database:
     def __init__(self):
-        self.engine = create_async_engine(settings.DATABASE_URL,
-                                          future=True,
-                                          pool_size=settings.DATABASE_POOL_SIZE,
-                                          max_overflow=8)
+        self.is_sqlite = settings.DATABASE_ENGINE is DatabaseEngine.SQLITE
+        self.engine = create_async_engine(settings.DATABASE_URL, future=True, **pool_options())
+        if self.is_sqlite:
+            event.listen(self.engine.sync_engine, "connect", set_sqlite_pragmas)
+        self.session_factory = async_sessionmaker(self.engine, class_=AsyncSession)
         self.Base = self._get_base()
+        self._write_lock = Lock()
+
+    def writer(self) -> AbstractAsyncContextManager[Any]:
+        """Serialize write transactions on SQLite, which allows a single writer at a time.
+
+        Waiting writers are queued in FIFO order instead of failing with
+        ``database is locked``. On PostgreSQL this is a no-op.
+        """
+        return self._write_lock if self.is_sqlite else nullcontext()
 
     def _get_base(self):
         base = declarative_base(constructor=declarative_nested_model_constructor)
 
         class BaseModel(base):
             __abstract__ = True
+            # Without AUTOINCREMENT SQLite reuses the largest rowid once its row is
+            # deleted, so the public ID of a consumed token would resolve to a new one.
+            __table_args__: ClassVar[dict[str, Any]] = {"sqlite_autoincrement": True}
 
             id: Mapped[int] = mapped_column(
                 Integer,
                 primary_key=True,
                 autoincrement=True,
-                unique=True,
-                index=True,
                 nullable=False,
             )
             created_at: Mapped[datetime] = mapped_column(server_default=func.now())
@@ -72,12 +151,54 @@ class Database:
 
         return BaseModel
 
+    async def lock_schema(self, conn: AsyncConnection | AsyncSession) -> None:
+        """Serialize schema changes and migrations between worker processes.
+
+        Every worker runs them on startup, so on PostgreSQL they take an advisory
+        lock held until the end of the current transaction of ``conn``. SQLite is
+        limited to a single worker and needs no lock.
+        """
+        if not self.is_sqlite:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+
     async def create_tables(self):
         async with self.engine.begin() as conn:
-            await conn.run_sync(self.Base.metadata.create_all)
+            await self.lock_schema(conn)
+
+            if settings.TOKEN_PARTITIONING_ENABLED:
+                # Only the document column is used, so the normalized tables are not created
+                await conn.run_sync(self.Base.metadata.create_all, tables=[self.Base.metadata.tables[TOKENS_TABLE]])
+
+                if not await is_partitioned(conn):
+                    msg = f"Table {TOKENS_TABLE!r} already exists and is not partitioned"
+                    raise RuntimeError(msg)
+
+                await create_partitions(conn)
+            else:
+                await conn.run_sync(self.Base.metadata.create_all)
+
+            if self.is_sqlite:
+                await self._check_sqlite_autoincrement(conn)
+
+            # The migrations upgrade PostgreSQL databases created by earlier versions
+            if not self.is_sqlite:
+                for statement in SCHEMA_MIGRATIONS:
+                    await conn.exec_driver_sql(statement)
+
+    async def _check_sqlite_autoincrement(self, conn: AsyncConnection) -> None:
+        rows = await conn.exec_driver_sql("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+        reusing_ids = sorted(
+            name for name, sql in rows if name in self.Base.metadata.tables and "AUTOINCREMENT" not in sql.upper()
+        )
+        if reusing_ids:
+            msg = (
+                f"SQLite tables {', '.join(reusing_ids)} were created without AUTOINCREMENT and reuse the IDs "
+                f"of deleted tokens; recreate the database {settings.SQLITE_PATH!r}"
+            )
+            raise RuntimeError(msg)
 
     async def get_session(self):
-        session = async_sessionmaker(self.engine, class_=AsyncSession)()
+        session = self.session_factory()
         try:
             yield session
         finally:
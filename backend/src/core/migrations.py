@@ -0,0 +1,57 @@
+_NORMALIZED_TABLES = (
+    "tokens",
+    "users",
+    "children",
+    "organization_infos_users",
+    "organization_infos_children",
+    "organizations_users",
+    "organizations_children",
+    "classes_users",
+    "classes_children",
+)
+
+# (table, column, referenced table)
+_FOREIGN_KEYS = (
+    ("users", "token_id", "tokens"),
+    ("children", "user_id", "users"),
+    ("organization_infos_users", "user_id", "users"),
+    ("organization_infos_children", "child_id", "children"),
+    ("organizations_users", "organization_info_id", "organization_infos_users"),
+    ("organizations_children", "organization_info_id", "organization_infos_children"),
+    ("classes_users", "organization_info_id", "organization_infos_users"),
+    ("classes_children", "organization_info_id", "organization_infos_children"),
+)
+
+
+def _cascade_foreign_key(table: str, column: str, referenced_table: str) -> str:
+    constraint = f"{table}_{column}_fkey"
+    return f"""
+    DO $$
+    BEGIN
+        IF to_regclass('{table}') IS NULL THEN
+            RETURN;
+        END IF;
+
+        CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column});
+
+        IF EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{constraint}' AND confdeltype <> 'c') THEN
+            ALTER TABLE {table}
+                DROP CONSTRAINT {constraint},
+                ADD CONSTRAINT {constraint} FOREIGN KEY ({column}) REFERENCES {referenced_table} (id) ON DELETE CASCADE;
+        END IF;
+    END $$
+    """  # noqa: S608
+
+
+SCHEMA_MIGRATIONS: tuple[str, ...] = (
+    # Document storage mode (TOKEN_STORAGE_MODE=document)
+    "ALTER TABLE tokens ADD COLUMN IF NOT EXISTS users_document JSONB",
+    # Pre-serialized GET responses
+    "ALTER TABLE tokens ADD COLUMN IF NOT EXISTS response_json BYTEA",
+    # Unique indexes duplicating the primary keys
+    *(f"DROP INDEX IF EXISTS ix_{table}_id" for table in _NORMALIZED_TABLES),
+    # Indexed foreign keys with cascading deletes
+    *(_cascade_foreign_key(*foreign_key) for foreign_key in _FOREIGN_KEYS),
+    # Live token lookup by id, expires_at and time_to_refresh
+    "CREATE INDEX IF NOT EXISTS ix_tokens_id_expires_at_time_to_refresh ON tokens (id, expires_at, time_to_refresh)",
+)
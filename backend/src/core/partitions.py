@@ -0,0 +1,157 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from math import ceil
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.config import settings
+
+TOKENS_TABLE = "tokens"
+_PARTITION_PREFIX = f"{TOKENS_TABLE}_p"
+_NAME_FORMAT = "%Y%m%d%H%M%S"
+
+
+class Partition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+
+def partition_name(start: datetime, end: datetime) -> str:
+    return f"{_PARTITION_PREFIX}{start:{_NAME_FORMAT}}_{end:{_NAME_FORMAT}}"
+
+
+def parse_partition_name(name: str) -> Partition | None:
+    if not name.startswith(_PARTITION_PREFIX):
+        return None
+
+    try:
+        start, end = name.removeprefix(_PARTITION_PREFIX).split("_")
+        return Partition(
+            name,
+            datetime.strptime(start, _NAME_FORMAT).replace(tzinfo=UTC),
+            datetime.strptime(end, _NAME_FORMAT).replace(tzinfo=UTC),
+        )
+    except ValueError:
+        return None
+
+
+def required_partitions(now: datetime, interval_seconds: int, precreate: int) -> list[Partition]:
+    """Return the partitions that must exist to accept tokens created from ``now`` on.
+
+    Tokens issued now expire ``TOKEN_EXPIRES_SECONDS`` later, so every interval up
+    to that point is covered, plus ``precreate`` spare intervals in case
+    maintenance is delayed.
+
+    Args:
+        now (datetime): Current time.
+        interval_seconds (int): Width of one partition.
+        precreate (int): Number of additional future partitions.
+
+    Returns:
+        list[Partition]: Partitions ordered by their lower bound.
+    """
+    interval = timedelta(seconds=interval_seconds)
+    epoch = datetime.fromtimestamp(0, UTC)
+    first = epoch + interval * ((now - epoch) // interval)
+    count = ceil(settings.TOKEN_EXPIRES_SECONDS / interval_seconds) + 1 + precreate
+
+    partitions: list[Partition] = []
+    for index in range(count):
+        start = first + interval * index
+        end = start + interval
+        partitions.append(Partition(partition_name(start, end), start, end))
+
+    return partitions
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool | None:
+    """Tell whether ``tokens`` is a partitioned table.
+
+    Returns:
+        bool | None: ``None`` when the table does not exist.
+    """
+    relkind = await conn.scalar(
+        text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": TOKENS_TABLE},
+    )
+    if relkind is None:
+        return None
+
+    return relkind == "p"
+
+
+async def get_partitions(conn: AsyncConnection) -> list[Partition]:
+    names = await conn.scalars(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)",
+        ),
+        {"table": TOKENS_TABLE},
+    )
+
+    partitions = [partition for name in names if (partition := parse_partition_name(name)) is not None]
+
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+async def create_partitions(conn: AsyncConnection, now: datetime | None = None) -> list[str]:
+    """Create the missing current and future partitions of ``tokens``.
+
+    Intervals overlapping an existing partition (for example after
+    ``TOKEN_PARTITION_INTERVAL_SECONDS`` was changed) are skipped.
+
+    Args:
+        conn (AsyncConnection): Connection inside a transaction.
+        now (datetime | None, optional): Current time, defaults to ``datetime.now(UTC)``.
+
+    Returns:
+        list[str]: Names of the created partitions.
+    """
+    existing = await get_partitions(conn)
+
+    created: list[str] = []
+    for partition in required_partitions(
+        now or datetime.now(UTC),
+        settings.TOKEN_PARTITION_INTERVAL_SECONDS,
+        settings.TOKEN_PARTITION_PRECREATE,
+    ):
+        if any(partition.start < other.end and other.start < partition.end for other in existing):
+            continue
+
+        await conn.exec_driver_sql(
+            f'CREATE TABLE "{partition.name}" PARTITION OF {TOKENS_TABLE} '
+            f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')",
+        )
+        existing.append(partition)
+        created.append(partition.name)
+
+    return created
+
+
+async def drop_expired_partitions(conn: AsyncConnection, now: datetime | None = None) -> list[str]:
+    """Detach and drop the partitions whose tokens have all expired.
+
+    Args:
+        conn (AsyncConnection): Connection inside a transaction.
+        now (datetime | None, optional): Current time, defaults to ``datetime.now(UTC)``.
+
+    Returns:
+        list[str]: Names of the dropped partitions.
+    """
+    now = now or datetime.now(UTC)
+
+    dropped: list[str] = []
+    for partition in await get_partitions(conn):
+        if partition.end > now:
+            continue
+
+        await conn.exec_driver_sql(f'ALTER TABLE {TOKENS_TABLE} DETACH PARTITION "{partition.name}"')
+        await conn.exec_driver_sql(f'DROP TABLE "{partition.name}"')
+        dropped.append(partition.name)
+
+    return dropped
@@ -0,0 +1,196 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from dataclasses import field
+from time import perf_counter
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import Pool
+from sqlalchemy.pool import PoolProxiedConnection
+
+from src.core.config import DatabaseEngine
+from src.core.config import DatabasePooling
+from src.core.config import settings
+
+# Upper bounds of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class CheckoutStats:
+    """Checkout wait time histogram and error counters of a connection pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    wait_sum_ms: float = 0
+    wait_max_ms: float = 0
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1))
+
+    def observe(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.wait_sum_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.wait_buckets[bisect_left(CHECKOUT_WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "wait_ms": {
+                "sum": round(self.wait_sum_ms, 3),
+                "max": round(self.wait_max_ms, 3),
+                "buckets": {
+                    **{
+                        f"le_{bound}": count
+                        for bound, count in zip(CHECKOUT_WAIT_BUCKETS_MS, self.wait_buckets[:-1], strict=True)
+                    },
+                    "le_inf": self.wait_buckets[-1],
+                },
+            },
+        }
+
+
+class InstrumentedPool(Pool):
+    """Pool mixin that records how long ``connect`` waits for a connection.
+
+    The wait covers the whole checkout: queueing for a free connection, opening a
+    new one and the pre-ping. Checkouts that hit the pool timeout are counted
+    separately. The statistics survive ``Engine.dispose``, which recreates the pool.
+    """
+
+    checkout_stats: CheckoutStats
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.checkout_stats.timeouts += 1
+            raise
+        except Exception:
+            self.checkout_stats.errors += 1
+            raise
+
+        self.checkout_stats.observe((perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats  # type: ignore[attr-defined]
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        return self.checkout_stats.stats()
+
+
+class InstrumentedQueuePool(InstrumentedPool, AsyncAdaptedQueuePool):
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pooling": DatabasePooling.QUEUE.value,
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": settings.DATABASE_POOL_MAX_OVERFLOW,
+            **super().stats(),
+        }
+
+
+@dataclass
+class ConnectionCounter:
+    """Number of connections checked out of a pool, kept by its ``checkout`` and ``checkin`` events."""
+
+    checked_out: int = 0
+
+    def listen(self, pool: Pool) -> None:
+        event.listen(pool, "checkout", self._checkout)
+        event.listen(pool, "checkin", self._checkin)
+
+    def remove(self, pool: Pool) -> None:
+        event.remove(pool, "checkout", self._checkout)
+        event.remove(pool, "checkin", self._checkin)
+
+    def _checkout(self, *_: Any) -> None:
+        self.checked_out += 1
+
+    def _checkin(self, *_: Any) -> None:
+        self.checked_out -= 1
+
+
+class InstrumentedNullPool(InstrumentedPool, NullPool):
+    """Null pool that counts its checked-out connections.
+
+    ``recreate`` copies the event listeners of the pool to the new one, so the new
+    pool drops its own counter and keeps counting in the one it inherited; connections
+    returned to the disposed pool are still subtracted from it.
+    """
+
+    connections: ConnectionCounter
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.connections = ConnectionCounter()
+        self.connections.listen(self)
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()
+        pool.connections.remove(pool)  # type: ignore[attr-defined]
+        pool.connections = self.connections  # type: ignore[attr-defined]
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pooling": DatabasePooling.NULL.value,
+            "checked_out": self.connections.checked_out,
+            **super().stats(),
+        }
+
+
+def pool_options() -> dict[str, Any]:
+    """Build the pooling arguments of ``create_async_engine`` from the settings.
+
+    ``queue`` keeps up to ``DATABASE_POOL_SIZE`` connections open in the application.
+    ``null`` opens a connection per checkout and closes it on return, leaving pooling
+    to an external pooler such as PgBouncer.
+
+    ``DATABASE_STATEMENT_CACHE_SIZE=0`` disables the prepared statement caches of
+    asyncpg and SQLAlchemy and gives every prepared statement a unique name, so
+    statements never collide on server connections shared by a transaction-mode
+    pooler.
+    """
+    options: dict[str, Any] = {}
+
+    if settings.DATABASE_POOLING is DatabasePooling.NULL:
+        options["poolclass"] = InstrumentedNullPool
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        )
+
+    if settings.DATABASE_ENGINE is DatabaseEngine.POSTGRESQL:
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        }
+        if not settings.DATABASE_STATEMENT_CACHE_SIZE:
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def pool_stats(pool: Pool) -> dict[str, Any]:
+    return pool.stats() if isinstance(pool, InstrumentedPool) else {}
@@ -0,0 +1,150 @@
+from asyncio import gather
+from asyncio import wait_for
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio.session import async_sessionmaker
+
+from src.core.config import settings
+from src.core.log import BaseClass
+from src.core.log import logger
+from src.core.pool import pool_options
+from src.core.pool import pool_stats
+
+# Seconds the replica is behind the primary; 0 when all received WAL is replayed
+REPLICATION_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+@dataclass(eq=False)
+class Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    healthy: bool = False
+    lag_seconds: float | None = None
+    reads: int = 0
+    errors: int = 0
+    last_error: str | None = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "reads": self.reads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "pool": pool_stats(self.engine.pool),
+        }
+
+
+class ReplicaSet(BaseClass):
+    def __init__(self, urls: Sequence[str], max_lag_seconds: float, check_timeout_seconds: float):
+        """Initialize the read replicas of the primary database.
+
+        Every replica gets its own engine with the pool settings of the primary.
+        Replicas are handed out round-robin; a replica is skipped until a health
+        check succeeds and while its replication lag exceeds ``max_lag_seconds``.
+
+        Args:
+            urls (Sequence[str]): SQLAlchemy URLs of the replicas.
+            max_lag_seconds (float): Largest replication lag of a replica that serves reads.
+            check_timeout_seconds (float): Longest time a health check may take.
+        """
+        self._SERVICE_NAME = "replica_set"
+
+        self.max_lag_seconds = max_lag_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self.replicas = [self._create_replica(url) for url in urls]
+
+        self._next = 0
+
+        self.primary_fallbacks = 0
+
+    def choose(self) -> Replica | None:
+        """Return the next replica that can serve reads, if any."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+
+            if replica.healthy and (replica.lag_seconds or 0) <= self.max_lag_seconds:
+                return replica
+
+        return None
+
+    async def check(self) -> int:
+        """Refresh health and replication lag of every replica.
+
+        Returns:
+            int: Number of replicas that can serve reads.
+        """
+        await gather(*(self._check_replica(replica) for replica in self.replicas))
+
+        return sum(replica.healthy and (replica.lag_seconds or 0) <= self.max_lag_seconds for replica in self.replicas)
+
+    def mark_failed(self, replica: Replica, error: Exception) -> None:
+        """Take a replica out of rotation until the next successful health check."""
+        replica.errors += 1
+        replica.last_error = str(error)
+
+        if replica.healthy:
+            replica.healthy = False
+            with self.get_log_context("mark_failed"):
+                logger.warning("Replica marked unhealthy", replica=replica.name, error=str(error))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+    async def close(self) -> None:
+        await gather(*(replica.engine.dispose() for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            lag = await wait_for(self._replication_lag(replica), self.check_timeout_seconds)
+        except Exception as e:
+            self.mark_failed(replica, e)
+            return
+
+        replica.lag_seconds = round(float(lag), 3)
+
+        if not replica.healthy:
+            replica.healthy = True
+            with self.get_log_context("check"):
+                logger.info("Replica marked healthy", replica=replica.name, lag_seconds=replica.lag_seconds)
+
+    @staticmethod
+    async def _replication_lag(replica: Replica) -> Any:
+        async with replica.engine.connect() as conn:
+            return await conn.scalar(text(REPLICATION_LAG_QUERY))
+
+    @staticmethod
+    def _create_replica(url: str) -> Replica:
+        engine = create_async_engine(url, future=True, **pool_options())
+        parsed_url = make_url(url)
+
+        return Replica(
+            name=f"{parsed_url.host}:{parsed_url.port}/{parsed_url.database}",
+            engine=engine,
+            session_factory=async_sessionmaker(engine, class_=AsyncSession),
+        )
+
+
+replica_set = ReplicaSet(
+    urls=settings.DATABASE_REPLICA_URLS,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_timeout_seconds=settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS,
+)
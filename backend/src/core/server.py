@@ -0,0 +1,155 @@
+"""Production entry point: ``python -m src.core.server``.
+
+Runs ``WORKERS`` worker processes of the ``SERVER_RUNTIME`` server on ``HOST:PORT``.
+On SIGTERM or SIGINT the workers stop accepting connections, wait up to
+``SERVER_TIMEOUT_GRACEFUL_SHUTDOWN`` seconds for in-flight requests and run the
+application shutdown, so rolling deploys drain instead of dropping requests.
+"""
+
+from collections.abc import Callable
+from importlib.util import find_spec
+from math import ceil
+from os import environ
+
+import uvicorn
+
+from src.core.config import ServerRuntime
+from src.core.config import settings
+from src.core.log import logger
+
+APP = "src.main:app"
+
+
+def worker_pool_limits(workers: int) -> tuple[int, int]:
+    """Split the connection budget of the server between its workers.
+
+    ``DATABASE_POOL_SIZE`` and ``DATABASE_POOL_MAX_OVERFLOW`` are totals for the whole
+    server, so the number of connections it opens does not grow with ``WORKERS``.
+    Every worker keeps at least one connection.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        tuple[int, int]: Pool size and max overflow of one worker.
+    """
+    pool_size = max(settings.DATABASE_POOL_SIZE // workers, 1)
+    max_overflow = ceil(settings.DATABASE_POOL_MAX_OVERFLOW / workers)
+
+    return pool_size, max_overflow
+
+
+def is_installed(module: str) -> bool:
+    return find_spec(module) is not None
+
+
+def require(runtime: ServerRuntime, module: str) -> None:
+    if not is_installed(module):
+        msg = f"SERVER_RUNTIME={runtime.value} requires {module!r}, install the {runtime.value!r} extra"
+        raise RuntimeError(msg)
+
+
+def run_uvicorn(runtime: ServerRuntime) -> None:
+    """Run uvicorn, on uvloop and httptools when installed unless ``uvicorn-asyncio`` is selected."""
+    fast = runtime is ServerRuntime.UVICORN
+    loop = "uvloop" if fast and is_installed("uvloop") else "asyncio"
+    http = "httptools" if fast and is_installed("httptools") else "h11"
+
+    logger.info("Starting uvicorn", loop=loop, http=http)
+
+    uvicorn.run(
+        APP,
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        timeout_keep_alive=settings.SERVER_TIMEOUT_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_TIMEOUT_GRACEFUL_SHUTDOWN,
+        log_config=None,
+    )
+
+
+def run_granian(runtime: ServerRuntime) -> None:
+    """Run Granian with HTTP/1.1 and HTTP/2 (including h2c with prior knowledge)."""
+    require(runtime, "granian")
+
+    from granian import Granian  # noqa: PLC0415
+    from granian.constants import HTTPModes  # noqa: PLC0415
+    from granian.constants import Interfaces  # noqa: PLC0415
+    from granian.constants import Loops  # noqa: PLC0415
+
+    loop = Loops.uvloop if is_installed("uvloop") else Loops.asyncio
+
+    logger.info("Starting granian", loop=loop.value)
+
+    Granian(
+        APP,
+        address=settings.HOST,
+        port=settings.PORT,
+        interface=Interfaces.ASGI,
+        workers=settings.WORKERS,
+        loop=loop,
+        http=HTTPModes.auto,
+        backlog=settings.SERVER_BACKLOG,
+        backpressure=settings.SERVER_LIMIT_CONCURRENCY,
+        workers_kill_timeout=settings.SERVER_TIMEOUT_GRACEFUL_SHUTDOWN,
+        log_enabled=False,
+    ).serve()
+
+
+def run_hypercorn(runtime: ServerRuntime) -> None:
+    """Run Hypercorn with HTTP/1.1 and HTTP/2 (h2c by upgrade or prior knowledge)."""
+    require(runtime, "hypercorn")
+
+    from hypercorn.config import Config  # noqa: PLC0415
+    from hypercorn.run import run  # noqa: PLC0415
+
+    config = Config()
+    config.application_path = APP
+    config.bind = [f"{settings.HOST}:{settings.PORT}"]
+    config.workers = settings.WORKERS
+    config.worker_class = "uvloop" if is_installed("uvloop") else "asyncio"
+    config.backlog = settings.SERVER_BACKLOG
+    config.keep_alive_timeout = settings.SERVER_TIMEOUT_KEEP_ALIVE
+    config.graceful_timeout = settings.SERVER_TIMEOUT_GRACEFUL_SHUTDOWN
+
+    logger.info("Starting hypercorn", worker_class=config.worker_class)
+
+    run(config)
+
+
+RUNNERS: dict[ServerRuntime, Callable[[ServerRuntime], None]] = {
+    ServerRuntime.UVICORN: run_uvicorn,
+    ServerRuntime.UVICORN_ASYNCIO: run_uvicorn,
+    ServerRuntime.GRANIAN: run_granian,
+    ServerRuntime.HYPERCORN: run_hypercorn,
+}
+
+
+def run() -> None:
+    pool_size, max_overflow = worker_pool_limits(settings.WORKERS)
+
+    # Worker processes load their own settings from the environment
+    environ["DATABASE_POOL_SIZE"] = str(pool_size)
+    environ["DATABASE_POOL_MAX_OVERFLOW"] = str(max_overflow)
+    settings.DATABASE_POOL_SIZE = pool_size
+    settings.DATABASE_POOL_MAX_OVERFLOW = max_overflow
+
+    logger.info(
+        "Starting server",
+        runtime=settings.SERVER_RUNTIME.value,
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+    )
+
+    RUNNERS[settings.SERVER_RUNTIME](settings.SERVER_RUNTIME)
+
+
+if __name__ == "__main__":
+    run()
@@ -4,19 +4,40 @@ import uvicorn
 from fastapi import FastAPI
 
 from src.core.config import Environment
+from src.core.config import TokenStorageBackend
 from src.core.config import settings
 from src.core.database import database
 from src.core.database import setup_database
+from src.core.replicas import replica_set
 from src.models import *  # noqa: F403
 from src.routers import main_router
+from src.services.partitions import token_partition_maintainer
+from src.services.reaper import token_reaper
+from src.services.replicas import replica_monitor
+from src.services.tokens import migrate_token_storage
+from src.services.write_buffer import token_write_buffer
 from src.utils.exception_handlers import register_exception_handlers
 from src.utils.middlewares import register_middleware
+from src.utils.responses import FastJSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # noqa: ARG001
-    await setup_database()
+    if settings.TOKEN_STORAGE_BACKEND is TokenStorageBackend.DATABASE:
+        await setup_database()
+        await migrate_token_storage()
+    if settings.TOKEN_PARTITIONING_ENABLED:
+        token_partition_maintainer.start()
+    elif settings.TOKEN_REAPER_ENABLED:
+        token_reaper.start()
+    if replica_set.replicas:
+        replica_monitor.start()
     yield
+    await replica_monitor.stop()
+    await token_partition_maintainer.stop()
+    await token_reaper.stop()
+    await token_write_buffer.close()
+    await replica_set.close()
     await database.close_database()
 
 
@@ -28,6 +49,7 @@ app = FastAPI(
     redoc_url=f"{settings.API_VERSION_PREFIX}/docs",
     openapi_url=f"{settings.API_VERSION_PREFIX}/openapi.json",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 register_middleware(app)
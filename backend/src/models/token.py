@@ -1,14 +1,20 @@
 from datetime import datetime
+from typing import Any
 
+from sqlalchemy import JSON
 from sqlalchemy import Boolean
-from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
+from sqlalchemy import LargeBinary
 from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 
+from src.core.config import settings
+from src.core.database import UTCDateTime
 from src.core.database import database
 
 
@@ -19,7 +25,8 @@ class ClassUser(database.Base):
     class_name: Mapped[str] = mapped_column(String(256), nullable=False)
 
     organization_info_id: Mapped[int] = mapped_column(
-        ForeignKey("organization_infos_users.id"),
+        ForeignKey("organization_infos_users.id", ondelete="CASCADE"),
+        index=True,
     )
     organization_info: Mapped["OrganizationInfoUser"] = relationship(
         "OrganizationInfoUser",
@@ -34,7 +41,8 @@ class ClassChild(database.Base):
     class_name: Mapped[str] = mapped_column(String(256), nullable=False)
 
     organization_info_id: Mapped[int] = mapped_column(
-        ForeignKey("organization_infos_children.id"),
+        ForeignKey("organization_infos_children.id", ondelete="CASCADE"),
+        index=True,
     )
     organization_info: Mapped["OrganizationInfoChild"] = relationship(
         "OrganizationInfoChild",
@@ -50,7 +58,8 @@ class OrganizationUser(database.Base):
     name: Mapped[str] = mapped_column(String(1024), nullable=False)
 
     organization_info_id: Mapped[int] = mapped_column(
-        ForeignKey("organization_infos_users.id"),
+        ForeignKey("organization_infos_users.id", ondelete="CASCADE"),
+        index=True,
     )
     organization_info: Mapped["OrganizationInfoUser"] = relationship(
         "OrganizationInfoUser",
@@ -66,7 +75,8 @@ class OrganizationChild(database.Base):
     name: Mapped[str] = mapped_column(String(1024), nullable=False)
 
     organization_info_id: Mapped[int] = mapped_column(
-        ForeignKey("organization_infos_children.id"),
+        ForeignKey("organization_infos_children.id", ondelete="CASCADE"),
+        index=True,
     )
     organization_info: Mapped["OrganizationInfoChild"] = relationship(
         "OrganizationInfoChild",
@@ -81,18 +91,23 @@ class OrganizationInfoUser(database.Base):
 
     classes: Mapped[list["ClassUser"]] = relationship(
         "ClassUser",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ClassUser.id",
         back_populates="organization_info",
     )
 
     organization: Mapped["OrganizationUser"] = relationship(
         "OrganizationUser",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
         uselist=False,
         back_populates="organization_info",
     )
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     user: Mapped["User"] = relationship("User", back_populates="organizations")
 
 
@@ -103,18 +118,23 @@ class OrganizationInfoChild(database.Base):
 
     classes: Mapped[list["ClassChild"]] = relationship(
         "ClassChild",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ClassChild.id",
         back_populates="organization_info",
     )
 
     organization: Mapped["OrganizationChild"] = relationship(
         "OrganizationChild",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
         uselist=False,
         back_populates="organization_info",
     )
 
-    child_id: Mapped[int] = mapped_column(ForeignKey("children.id"))
+    child_id: Mapped[int] = mapped_column(ForeignKey("children.id", ondelete="CASCADE"), index=True)
     child: Mapped["Child"] = relationship("Child", back_populates="organizations")
 
 
@@ -133,11 +153,14 @@ class Child(database.Base):
 
     organizations: Mapped[list["OrganizationInfoChild"]] = relationship(
         "OrganizationInfoChild",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="OrganizationInfoChild.id",
         back_populates="child",
     )
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     user: Mapped["User"] = relationship("User", back_populates="children")
 
 
@@ -156,35 +179,59 @@ class User(database.Base):
 
     children: Mapped[list["Child"]] = relationship(
         "Child",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="Child.id",
         back_populates="user",
     )
     organizations: Mapped[list["OrganizationInfoUser"]] = relationship(
         "OrganizationInfoUser",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="OrganizationInfoUser.id",
         back_populates="user",
     )
 
-    token_id: Mapped[int] = mapped_column(ForeignKey("tokens.id"))
+    token_id: Mapped[int] = mapped_column(ForeignKey("tokens.id", ondelete="CASCADE"), index=True)
     token: Mapped["Token"] = relationship("Token", back_populates="users")
 
 
 class Token(database.Base):
     __tablename__ = "tokens"
+    # Range partitions by expiration time are managed by src.core.partitions; the
+    # partition key has to be part of the primary key, so ``id`` alone is not unique.
+    __table_args__ = (
+        Index("ix_tokens_id_expires_at_time_to_refresh", "id", "expires_at", "time_to_refresh"),
+        {
+            "sqlite_autoincrement": True,
+            **({"postgresql_partition_by": "RANGE (expires_at)"} if settings.TOKEN_PARTITIONING_ENABLED else {}),
+        },
+    )
 
     refresh_token: Mapped[str] = mapped_column(String(16384), nullable=False)
     time_to_refresh: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        UTCDateTime,
         nullable=False,
     )
 
     users: Mapped[list["User"]] = relationship(
         "User",
-        lazy="joined",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="User.id",
         back_populates="token",
     )
+    users_document: Mapped[list[dict[str, Any]] | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True,
+    )
+    response_json: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
 
     expires_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        UTCDateTime,
+        primary_key=settings.TOKEN_PARTITIONING_ENABLED,
         nullable=False,
     )
@@ -0,0 +1,49 @@
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Sequence
+from datetime import datetime
+from typing import NamedTuple
+
+from src.schemas.token import Token as TokenSchema
+
+
+class StoredToken(NamedTuple):
+    content: bytes
+    expires_at: datetime
+
+
+class TokenRepository(ABC):
+    """Storage backend of tokens.
+
+    Every method is a complete unit of work: implementations commit their own
+    changes. Expired tokens (by ``expires_at`` or ``time_to_refresh``) are never
+    returned.
+    """
+
+    @abstractmethod
+    async def create_tokens(self, tokens: Sequence[TokenSchema], expires_at: datetime) -> list[int]:
+        """Store tokens and return their IDs in the order of ``tokens``."""
+
+    @abstractmethod
+    async def get_token(self, token_id: int) -> StoredToken | None:
+        """Return the serialized response of a live token."""
+
+    @abstractmethod
+    async def get_refresh_token(self, token_id: int) -> StoredToken | None:
+        """Return the serialized ``RefreshToken`` fields of a live token without its users."""
+
+    @abstractmethod
+    async def get_token_expiry(self, token_id: int) -> datetime | None:
+        """Return when a live token stops being valid without loading its content."""
+
+    @abstractmethod
+    async def get_tokens(self, token_ids: Sequence[int]) -> dict[int, bytes]:
+        """Return the serialized responses of the live tokens among ``token_ids`` by ID."""
+
+    @abstractmethod
+    async def consume_token(self, token_id: int) -> bytes | None:
+        """Atomically return the serialized response of a live token and delete it."""
+
+    @abstractmethod
+    async def delete_expired(self, batch_size: int) -> int:
+        """Delete up to ``batch_size`` expired tokens and return how many were deleted."""
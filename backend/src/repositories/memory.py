@@ -0,0 +1,167 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from secrets import randbelow
+from typing import Any
+
+from src.core.config import settings
+from src.core.log import BaseClass
+from src.repositories.base import StoredToken
+from src.repositories.base import TokenRepository
+from src.schemas.token import RefreshToken as RefreshTokenSchema
+from src.schemas.token import Token as TokenSchema
+from src.utils.encrypting import UUIDGenerator
+
+
+@dataclass(slots=True)
+class MemoryToken:
+    token: TokenSchema
+    content: bytes
+    expires_at: datetime
+
+
+class MemoryTokenRepository(TokenRepository, BaseClass):
+    def __init__(self, shards: int, wheel_resolution_seconds: float):
+        """Initialize a process-local token storage.
+
+        Tokens are kept in ``shards`` dictionaries keyed by ID, so no single dictionary
+        grows to the full working set. Expiration is tracked by a timing wheel: every
+        token is put into the slot of its expiration time and ``delete_expired`` only
+        visits the slots that have passed since the previous call.
+
+        IDs are random rather than sequential so that IDs issued before a restart do
+        not resolve to new tokens.
+
+        Args:
+            shards (int): Number of dictionaries tokens are spread over.
+            wheel_resolution_seconds (float): Time range covered by one wheel slot.
+        """
+        self._SERVICE_NAME = "memory_token_repository"
+
+        self.wheel_resolution_seconds = wheel_resolution_seconds
+
+        self._shards: list[dict[int, MemoryToken]] = [{} for _ in range(shards)]
+        self._wheel: dict[int, list[int]] = {}
+        self._cursor = self._slot(datetime.now(UTC))
+
+    async def create_tokens(self, tokens: Sequence[TokenSchema], expires_at: datetime) -> list[int]:
+        token_ids: list[int] = []
+
+        for token in tokens:
+            token_id = self._new_id()
+            token_expires_at = min(expires_at, self._aware(token.time_to_refresh))
+
+            self._shard(token_id)[token_id] = MemoryToken(token, token.model_dump_json().encode(), token_expires_at)
+            self._wheel.setdefault(max(self._slot(token_expires_at), self._cursor), []).append(token_id)
+            token_ids.append(token_id)
+
+        return token_ids
+
+    async def get_token(self, token_id: int) -> StoredToken | None:
+        entry = self._get_live(token_id)
+        if entry is None:
+            return None
+
+        return StoredToken(entry.content, entry.expires_at)
+
+    async def get_refresh_token(self, token_id: int) -> StoredToken | None:
+        entry = self._get_live(token_id)
+        if entry is None:
+            return None
+
+        return StoredToken(
+            RefreshTokenSchema.model_construct(
+                refresh_token=entry.token.refresh_token,
+                time_to_refresh=entry.token.time_to_refresh,
+            )
+            .model_dump_json()
+            .encode(),
+            entry.expires_at,
+        )
+
+    async def get_token_expiry(self, token_id: int) -> datetime | None:
+        entry = self._get_live(token_id)
+        return entry.expires_at if entry is not None else None
+
+    async def get_tokens(self, token_ids: Sequence[int]) -> dict[int, bytes]:
+        return {token_id: entry.content for token_id in token_ids if (entry := self._get_live(token_id)) is not None}
+
+    async def consume_token(self, token_id: int) -> bytes | None:
+        entry = self._get_live(token_id)
+        if entry is None:
+            return None
+
+        del self._shard(token_id)[token_id]
+
+        return entry.content
+
+    async def delete_expired(self, batch_size: int) -> int:
+        now = datetime.now(UTC)
+        now_slot = self._slot(now)
+        deleted = 0
+
+        while self._cursor <= now_slot and deleted < batch_size:
+            bucket = self._wheel.get(self._cursor, [])
+            pending: list[int] = []
+
+            while bucket and deleted < batch_size:
+                token_id = bucket.pop()
+                shard = self._shard(token_id)
+                entry = shard.get(token_id)
+
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    del shard[token_id]
+                    deleted += 1
+                elif self._cursor == now_slot:
+                    pending.append(token_id)
+
+            bucket.extend(pending)
+
+            if bucket:
+                break
+
+            self._wheel.pop(self._cursor, None)
+            if self._cursor == now_slot:
+                break
+            self._cursor += 1
+
+        return deleted
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "tokens": sum(len(shard) for shard in self._shards),
+            "shards": len(self._shards),
+            "wheel_slots": len(self._wheel),
+        }
+
+    def _get_live(self, token_id: int) -> MemoryToken | None:
+        entry = self._shard(token_id).get(token_id)
+        if entry is None or entry.expires_at <= datetime.now(UTC):
+            return None
+
+        return entry
+
+    def _shard(self, token_id: int) -> dict[int, MemoryToken]:
+        return self._shards[token_id % len(self._shards)]
+
+    def _new_id(self) -> int:
+        while True:
+            token_id = randbelow(UUIDGenerator.MAX_ID) + 1
+            if token_id not in self._shard(token_id):
+                return token_id
+
+    def _slot(self, moment: datetime) -> int:
+        return int(moment.timestamp() // self.wheel_resolution_seconds)
+
+    @staticmethod
+    def _aware(moment: datetime) -> datetime:
+        return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
+
+
+memory_token_repository = MemoryTokenRepository(
+    shards=settings.TOKEN_MEMORY_SHARDS,
+    wheel_resolution_seconds=settings.TOKEN_MEMORY_WHEEL_RESOLUTION_SECONDS,
+)
@@ -0,0 +1,257 @@
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from typing import Any
+
+from asyncpg import Connection
+from asyncpg import Record
+from asyncpg.prepared_stmt import PreparedStatement
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import TokenStorageMode
+from src.core.config import settings
+from src.core.database import database
+from src.repositories.base import StoredToken
+from src.repositories.base import TokenRepository
+from src.repositories.rows import token_rows
+from src.schemas.token import RefreshToken as RefreshTokenSchema
+from src.schemas.token import Token as TokenSchema
+
+_STATEMENTS = {
+    "get_token": (
+        "SELECT response_json, expires_at, time_to_refresh FROM tokens "
+        "WHERE id = $1 AND expires_at > $2 AND time_to_refresh > $2"
+    ),
+    "get_refresh_token": (
+        "SELECT refresh_token, time_to_refresh, LEAST(expires_at, time_to_refresh) AS valid_until FROM tokens "
+        "WHERE id = $1 AND expires_at > $2 AND time_to_refresh > $2"
+    ),
+    "get_token_expiry": (
+        "SELECT LEAST(expires_at, time_to_refresh) FROM tokens "
+        "WHERE id = $1 AND expires_at > $2 AND time_to_refresh > $2"
+    ),
+    "get_tokens": (
+        "SELECT id, response_json FROM tokens "
+        "WHERE id = ANY($1::integer[]) AND expires_at > $2 AND time_to_refresh > $2"
+    ),
+    "consume_token": (
+        "WITH consumed AS ("
+        "DELETE FROM tokens "
+        "WHERE id = $1 AND expires_at > $2 AND time_to_refresh > $2 AND response_json IS NOT NULL "
+        "RETURNING response_json"
+        ") "
+        "SELECT (SELECT response_json FROM consumed) AS response_json, EXISTS ("
+        "SELECT FROM tokens WHERE id = $1 AND expires_at > $2 AND time_to_refresh > $2 AND response_json IS NULL"
+        ") AS legacy"
+    ),
+    "next_ids": "SELECT nextval(pg_get_serial_sequence($1, 'id')) FROM generate_series(1, $2)",
+}
+
+
+@dataclass(slots=True)
+class PreparedConnection:
+    """Pooled asyncpg connection with the token statements prepared on it so far.
+
+    Without ``statements`` (``DATABASE_STATEMENT_CACHE_SIZE=0``) every query is sent
+    as an unnamed statement, which is safe behind transaction-mode poolers.
+    """
+
+    connection: Connection
+    statements: dict[str, PreparedStatement] | None
+
+    async def fetch(self, name: str, *args: Any) -> list[Record]:
+        if self.statements is None:
+            return await self.connection.fetch(_STATEMENTS[name], *args)
+        return await (await self._prepare(self.statements, name)).fetch(*args)
+
+    async def fetchrow(self, name: str, *args: Any) -> Record | None:
+        if self.statements is None:
+            return await self.connection.fetchrow(_STATEMENTS[name], *args)
+        return await (await self._prepare(self.statements, name)).fetchrow(*args)
+
+    async def fetchval(self, name: str, *args: Any) -> Any:
+        if self.statements is None:
+            return await self.connection.fetchval(_STATEMENTS[name], *args)
+        return await (await self._prepare(self.statements, name)).fetchval(*args)
+
+    async def _prepare(self, statements: dict[str, PreparedStatement], name: str) -> PreparedStatement:
+        if name not in statements:
+            statements[name] = await self.connection.prepare(_STATEMENTS[name], name=f"tokens_{name}")
+        return statements[name]
+
+
+class AsyncpgTokenRepository(TokenRepository):
+    def __init__(self, fallback: TokenRepository, engine: AsyncEngine | None = None):
+        """Initialize the asyncpg data access path of the hot token operations.
+
+        Statements run directly on the asyncpg connections of the engine's pool,
+        bypassing the ORM. They are prepared once per connection under a fixed name
+        unless the statement cache is disabled; inserts pre-allocate IDs from the
+        table sequences and load every table with ``COPY``. Reads return the stored
+        response JSON as is.
+
+        Tokens without stored response JSON and the expiry sweep are delegated to
+        ``fallback``.
+
+        Args:
+            fallback (TokenRepository): ORM repository for the remaining operations.
+            engine (AsyncEngine | None, optional): Engine whose pool is used. Defaults to
+                ``database.engine``.
+        """
+        self.fallback = fallback
+        self.engine = engine or database.engine
+
+    async def create_tokens(
+        self,
+        tokens: Sequence[TokenSchema],
+        expires_at: datetime | Sequence[datetime],
+        *,
+        durable: bool = True,
+    ) -> list[int]:
+        expirations = [expires_at] * len(tokens) if isinstance(expires_at, datetime) else expires_at
+
+        async with self._connection() as prepared, prepared.connection.transaction():
+            connection = prepared.connection
+            if not durable:
+                await connection.execute("SET LOCAL synchronous_commit = off")
+
+            token_ids = await self._next_ids(prepared, "tokens", len(tokens))
+
+            await connection.copy_records_to_table(
+                "tokens",
+                columns=["id", "refresh_token", "time_to_refresh", "response_json", "expires_at"],
+                records=[
+                    (
+                        token_id,
+                        token.refresh_token,
+                        self._utc(token.time_to_refresh),
+                        token.model_dump_json().encode(),
+                        self._utc(token_expires_at),
+                    )
+                    for token_id, token, token_expires_at in zip(token_ids, tokens, expirations, strict=True)
+                ],
+            )
+
+            # In document mode the stored response JSON is the only copy of the users tree
+            if settings.TOKEN_STORAGE_MODE is not TokenStorageMode.DOCUMENT:
+                await self._copy_nested_rows(prepared, token_ids, tokens)
+
+        return token_ids
+
+    async def get_token(self, token_id: int) -> StoredToken | None:
+        async with self._connection() as prepared:
+            row = await prepared.fetchrow("get_token", token_id, datetime.now(UTC))
+
+        if row is None:
+            return None
+        if row["response_json"] is None:
+            return await self.fallback.get_token(token_id)
+
+        return StoredToken(row["response_json"], min(row["expires_at"], row["time_to_refresh"]))
+
+    async def get_refresh_token(self, token_id: int) -> StoredToken | None:
+        async with self._connection() as prepared:
+            row = await prepared.fetchrow("get_refresh_token", token_id, datetime.now(UTC))
+
+        if row is None:
+            return None
+
+        return StoredToken(
+            RefreshTokenSchema.model_construct(
+                refresh_token=row["refresh_token"],
+                time_to_refresh=row["time_to_refresh"],
+            )
+            .model_dump_json()
+            .encode(),
+            row["valid_until"],
+        )
+
+    async def get_token_expiry(self, token_id: int) -> datetime | None:
+        async with self._connection() as prepared:
+            return await prepared.fetchval("get_token_expiry", token_id, datetime.now(UTC))
+
+    async def get_tokens(self, token_ids: Sequence[int]) -> dict[int, bytes]:
+        async with self._connection() as prepared:
+            rows = await prepared.fetch("get_tokens", list(token_ids), datetime.now(UTC))
+
+        tokens = {row["id"]: row["response_json"] for row in rows if row["response_json"] is not None}
+        if pending := [row["id"] for row in rows if row["response_json"] is None]:
+            tokens.update(await self.fallback.get_tokens(pending))
+
+        return tokens
+
+    async def consume_token(self, token_id: int) -> bytes | None:
+        async with self._connection() as prepared:
+            row = await prepared.fetchrow("consume_token", token_id, datetime.now(UTC))
+
+        # Only a live token without stored response JSON is rebuilt by the fallback;
+        # unknown, expired and already consumed tokens are answered in one round trip
+        if row["legacy"]:
+            return await self.fallback.consume_token(token_id)
+
+        return row["response_json"]
+
+    async def delete_expired(self, batch_size: int) -> int:
+        return await self.fallback.delete_expired(batch_size)
+
+    async def _copy_nested_rows(
+        self,
+        prepared: PreparedConnection,
+        token_ids: list[int],
+        tokens: Sequence[TokenSchema],
+    ) -> None:
+        tables = token_rows.convert(tokens)
+        tables[0].ids = token_ids
+
+        for table in tables[1:]:
+            table.ids = await self._copy_rows(
+                prepared,
+                table.table_name,
+                table.columns,
+                table.records(),
+                with_ids=not table.is_leaf,
+            )
+
+    async def _copy_rows(
+        self,
+        prepared: PreparedConnection,
+        table: str,
+        columns: Sequence[str],
+        records: list[tuple[Any, ...]],
+        *,
+        with_ids: bool = True,
+    ) -> list[int]:
+        if not records:
+            return []
+
+        ids: list[int] = []
+
+        if with_ids:
+            ids = await self._next_ids(prepared, table, len(records))
+            columns = ["id", *columns]
+            records = [(row_id, *record) for row_id, record in zip(ids, records, strict=True)]
+
+        await prepared.connection.copy_records_to_table(table, columns=columns, records=records)
+
+        return ids
+
+    async def _next_ids(self, prepared: PreparedConnection, table: str, count: int) -> list[int]:
+        return [row[0] for row in await prepared.fetch("next_ids", table, count)]
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[PreparedConnection]:
+        async with self.engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            yield PreparedConnection(
+                raw_connection.driver_connection,  # type: ignore[arg-type]
+                raw_connection.info.setdefault("token_statements", {})
+                if settings.DATABASE_STATEMENT_CACHE_SIZE
+                else None,
+            )
+
+    @staticmethod
+    def _utc(moment: datetime) -> datetime:
+        return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
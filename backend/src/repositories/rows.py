@@ -0,0 +1,215 @@
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from operator import attrgetter
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import class_mapper
+
+from src.models.token import Token as TokenModel
+from src.schemas.token import Token as TokenSchema
+from src.utils.utils import nested_schema
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RowConverter:
+    """Conversion of a schema into insert rows of a model and of its related models.
+
+    Built once per schema/model pair by ``compile``: the columns copied from every
+    schema and the relationships to descend into are resolved from the mappers
+    upfront, together with the getters reading exactly these columns, so converting
+    a payload is a single walk over its objects.
+    """
+
+    model: type[DeclarativeBase]
+    columns: tuple[str, ...]
+    parent_key: str | None
+    children: tuple[tuple[str, "RowConverter"], ...]
+    values: Callable[[Any], tuple[Any, ...]]
+    row: Callable[[Any, int | None], dict[str, Any]]
+
+    @classmethod
+    def compile(
+        cls,
+        schema: type[BaseModel],
+        model: type[DeclarativeBase],
+        parent_key: str | None = None,
+    ) -> "RowConverter":
+        """Match the fields of ``schema`` to the columns and relationships of ``model``.
+
+        Fields named like a column are copied to the row. Fields named like a
+        one-to-many or one-to-one relationship are converted with the related model.
+        Other fields are ignored.
+
+        Args:
+            schema (type[BaseModel]): Schema of the converted objects.
+            model (type[DeclarativeBase]): Model of the rows.
+            parent_key (str | None, optional): Foreign key column referencing the parent row.
+
+        Raises:
+            ValueError: A relationship field does not hold schemas or is not owned by
+                ``model``.
+        """
+        mapper = class_mapper(model)
+        columns: list[str] = []
+        children: list[tuple[str, RowConverter]] = []
+
+        for name, schema_field in schema.model_fields.items():
+            if name in mapper.relationships:
+                relationship = mapper.relationships[name]
+                child_schema = nested_schema(schema_field.annotation)
+                if child_schema is None or len(relationship.local_remote_pairs) != 1:
+                    msg = f"Cannot convert {schema.__name__}.{name} into {model.__name__}.{name}"
+                    raise ValueError(msg)
+
+                [(_, remote_column)] = relationship.local_remote_pairs
+                if remote_column.table is not relationship.mapper.local_table:
+                    msg = f"{model.__name__}.{name} is not a one-to-many or one-to-one relationship"
+                    raise ValueError(msg)
+
+                children.append(
+                    (
+                        name,
+                        cls.compile(
+                            child_schema,
+                            relationship.mapper.class_,
+                            relationship.mapper.get_property_by_column(remote_column).key,
+                        ),
+                    ),
+                )
+            elif name in mapper.columns:
+                columns.append(name)
+
+        values = _values_getter(columns)
+
+        return cls(
+            model,
+            tuple(columns),
+            parent_key,
+            tuple(children),
+            values,
+            _row_builder(columns, parent_key, values),
+        )
+
+    def convert(self, items: Sequence[BaseModel]) -> list["TableRows"]:
+        """Collect the rows of ``items`` and of all their nested objects.
+
+        Args:
+            items (Sequence[BaseModel]): Validated objects of the compiled schema.
+
+        Returns:
+            list[TableRows]: Rows per model, every model after the model it references.
+        """
+        tables: list[TableRows] = []
+        root = TableRows.create(self, None, tables)
+
+        for item in items:
+            root.add(item, -1)
+
+        return tables
+
+
+@dataclass(slots=True, eq=False)
+class TableRows:
+    """Rows of one model collected by ``RowConverter.convert``.
+
+    Foreign keys are kept as indexes into the parent rows until the IDs of the
+    parent rows are known; store them in ``ids`` before building the child rows.
+    """
+
+    converter: RowConverter
+    parent: "TableRows | None"
+    children: list[tuple[str, "TableRows"]] = field(default_factory=list)
+    items: list[Any] = field(default_factory=list)
+    parent_indexes: list[int] = field(default_factory=list)
+    ids: list[int] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, converter: RowConverter, parent: "TableRows | None", tables: list["TableRows"]) -> "TableRows":
+        table = cls(converter, parent)
+        tables.append(table)
+        table.children = [(name, cls.create(child, table, tables)) for name, child in converter.children]
+        return table
+
+    @property
+    def model(self) -> type[DeclarativeBase]:
+        return self.converter.model
+
+    @property
+    def table_name(self) -> str:
+        return self.converter.model.__table__.name  # type: ignore[attr-defined]
+
+    @property
+    def is_leaf(self) -> bool:
+        return not self.children
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        if self.converter.parent_key is None:
+            return self.converter.columns
+        return (*self.converter.columns, self.converter.parent_key)
+
+    def add(self, item: Any, parent_index: int) -> None:
+        index = len(self.items)
+        self.items.append(item)
+        self.parent_indexes.append(parent_index)
+
+        for name, table in self.children:
+            value = getattr(item, name)
+            if value is None:
+                continue
+            if isinstance(value, list):
+                for nested_item in value:
+                    table.add(nested_item, index)
+            else:
+                table.add(value, index)
+
+    def records(self) -> list[tuple[Any, ...]]:
+        """Return the rows as tuples in the order of ``columns``."""
+        values = self.converter.values
+        if self.parent is None:
+            return [values(item) for item in self.items]
+
+        parent_ids = self.parent.ids
+        return [
+            (*values(item), parent_ids[parent_index])
+            for item, parent_index in zip(self.items, self.parent_indexes, strict=True)
+        ]
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Return the rows as dicts keyed by ``columns``."""
+        row = self.converter.row
+        if self.parent is None:
+            return [row(item, None) for item in self.items]
+
+        parent_ids = self.parent.ids
+        return [
+            row(item, parent_ids[parent_index])
+            for item, parent_index in zip(self.items, self.parent_indexes, strict=True)
+        ]
+
+
+def _values_getter(columns: Sequence[str]) -> Callable[[Any], tuple[Any, ...]]:
+    getter = attrgetter(*columns)
+    if len(columns) == 1:
+        return lambda item: (getter(item),)
+    return getter
+
+
+def _row_builder(
+    columns: Sequence[str],
+    parent_key: str | None,
+    values: Callable[[Any], tuple[Any, ...]],
+) -> Callable[[Any, int | None], dict[str, Any]]:
+    names = tuple(columns)
+    if parent_key is None:
+        return lambda item, _parent_id: dict(zip(names, values(item), strict=True))
+
+    keys = (*names, parent_key)
+    return lambda item, parent_id: dict(zip(keys, (*values(item), parent_id), strict=True))
+
+
+token_rows = RowConverter.compile(TokenSchema, TokenModel)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
+from src.routers.metrics import router as metrics_router
 from src.routers.tokens import router as tokens_router
 
 main_router = APIRouter()
 main_router.include_router(tokens_router)
+main_router.include_router(metrics_router)
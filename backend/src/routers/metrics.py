@@ -0,0 +1,36 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from src.core.config import TokenStorageBackend
+from src.core.config import settings
+from src.core.database import database
+from src.core.pool import pool_stats
+from src.core.replicas import replica_set
+from src.repositories.memory import memory_token_repository
+from src.services.partitions import token_partition_maintainer
+from src.services.reaper import token_reaper
+from src.services.replicas import replica_monitor
+from src.services.write_buffer import token_write_buffer
+from src.utils.cache import token_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/")
+async def get_metrics() -> dict[str, Any]:
+    metrics = {
+        "token_cache": token_cache.stats(),
+        "token_reaper": token_reaper.stats(),
+        "token_partition_maintainer": token_partition_maintainer.stats(),
+    }
+    if settings.TOKEN_WRITE_BUFFER_ENABLED:
+        metrics["token_write_buffer"] = token_write_buffer.stats()
+    if settings.TOKEN_STORAGE_BACKEND is TokenStorageBackend.MEMORY:
+        metrics["memory_token_repository"] = memory_token_repository.stats()
+    else:
+        metrics["database_pool"] = pool_stats(database.engine.pool)
+    if replica_set.replicas:
+        metrics["replica_monitor"] = replica_monitor.stats()
+
+    return metrics
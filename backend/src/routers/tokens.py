@@ -1,18 +1,30 @@
 from typing import Annotated
+from typing import Any
 
 from fastapi import APIRouter
+from fastapi import Body
 from fastapi import Depends
+from fastapi import Header
+from fastapi import Query
 from fastapi import status
 from fastapi.responses import Response
 
-from src.core.database import AsyncSession
-from src.core.database import database
+from src.core.config import settings
 from src.core.log import LogLevel
 from src.core.log import log_function_calls
+from src.repositories.base import TokenRepository
 from src.schemas.token import Token as TokenSchema
+from src.schemas.token import TokenBatchItem
 from src.schemas.token import TokenID
+from src.schemas.token import TokenLookupResult
+from src.services.storage import get_token_repository
 from src.services.tokens import TokenService
 from src.utils.app_exceptions import TokenException
+from src.utils.projection import FieldProjection
+from src.utils.responses import FastJSONResponse
+from src.utils.responses import etag_matches
+from src.utils.responses import token_cache_headers
+from src.utils.responses import token_etag
 
 router = APIRouter(prefix="/tokens", tags=["tokens"])
 
@@ -24,21 +36,102 @@ router = APIRouter(prefix="/tokens", tags=["tokens"])
     responses=TokenException.TokenCreateError.get_response_schema(),
 )
 @log_function_calls(level=LogLevel.INFO.value)
-async def create_token(token: TokenSchema, session: Annotated[AsyncSession, Depends(database.get_session)]):
-    return Response(
-        content=(await TokenService(session).create_token(token)).model_dump_json(),
-        status_code=status.HTTP_201_CREATED,
-    )
+async def create_token(token: TokenSchema, repository: Annotated[TokenRepository, Depends(get_token_repository)]):
+    return FastJSONResponse(await TokenService(repository).create_token(token), status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/batch",
+    response_model=list[TokenBatchItem],
+    status_code=status.HTTP_200_OK,
+)
+@log_function_calls(level=LogLevel.INFO.value)
+async def create_tokens(
+    tokens: Annotated[list[dict[str, Any]], Body(min_length=1, max_length=settings.TOKEN_BATCH_MAX_SIZE)],
+    repository: Annotated[TokenRepository, Depends(get_token_repository)],
+):
+    return FastJSONResponse(await TokenService(repository).create_tokens(tokens))
+
+
+@router.post(
+    "/lookup",
+    response_model=TokenLookupResult,
+    status_code=status.HTTP_200_OK,
+)
+@log_function_calls(level=LogLevel.INFO.value)
+async def get_tokens(
+    token_ids: Annotated[list[str], Body(min_length=1, max_length=settings.TOKEN_BATCH_MAX_SIZE)],
+    repository: Annotated[TokenRepository, Depends(get_token_repository)],
+):
+    return Response(content=await TokenService(repository).get_tokens(token_ids), media_type="application/json")
 
 
 @router.get(
     "/{token_id}",
     response_model=TokenSchema,
     responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "The token matches the entity tag in If-None-Match"},
+        **TokenException.TokenValidationError.get_response_schema(
+            "Token validation failed or requested token fields are invalid",
+        ),
+        **TokenException.TokenNotFoundError.get_response_schema(),
+    },
+)
+@log_function_calls(level=LogLevel.INFO.value)
+async def get_token(
+    token_id: str,
+    repository: Annotated[TokenRepository, Depends(get_token_repository)],
+    consume: Annotated[
+        bool | None,
+        Query(description="Delete the token once it is read; defaults to TOKEN_CONSUME_ON_READ"),
+    ] = None,
+    fields: Annotated[
+        str | None,
+        Query(
+            description="Comma-separated dotted paths of the returned fields, e.g. refresh_token,users.first_name",
+        ),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    service = TokenService(repository)
+    projection = FieldProjection.parse(fields) if fields is not None else None
+    variant = projection.key if projection is not None else None
+
+    if settings.TOKEN_CONSUME_ON_READ if consume is None else consume:
+        stored_token = await service.get_token(token_id, consume=True, fields=projection)
+        return Response(
+            content=stored_token.content,
+            media_type="application/json",
+            headers={"Cache-Control": "no-store"},
+        )
+
+    if if_none_match is not None:
+        expires_at = await service.get_token_expiry(token_id)
+        etag = token_etag(token_id, expires_at, variant)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=token_cache_headers(etag, expires_at),
+            )
+
+    stored_token = await service.get_token(token_id, fields=projection)
+    return Response(
+        content=stored_token.content,
+        media_type="application/json",
+        headers=token_cache_headers(token_etag(token_id, stored_token.expires_at, variant), stored_token.expires_at),
+    )
+
+
+@router.head(
+    "/{token_id}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"description": "The token is live; it expires at the time in the Expires header"},
         **TokenException.TokenValidationError.get_response_schema(),
         **TokenException.TokenNotFoundError.get_response_schema(),
     },
 )
 @log_function_calls(level=LogLevel.INFO.value)
-async def get_token(token_id: str, session: Annotated[AsyncSession, Depends(database.get_session)]):
-    return await TokenService(session).get_token(token_id)
+async def check_token(token_id: str, repository: Annotated[TokenRepository, Depends(get_token_repository)]):
+    expires_at = await TokenService(repository).get_token_expiry(token_id)
+    return Response(headers=token_cache_headers(token_etag(token_id, expires_at), expires_at))
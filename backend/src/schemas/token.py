@@ -4,6 +4,8 @@ from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
 
+from src.utils.app_exceptions import ErrorResponse
+
 
 class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -49,9 +51,12 @@ class User(BaseSchema):
     children: list[Child] | None = None
 
 
-class Token(BaseSchema):
+class RefreshToken(BaseSchema):
     refresh_token: str = Field(..., max_length=16384)
     time_to_refresh: datetime
+
+
+class Token(RefreshToken):
     users: list[User]
 
 
@@ -67,3 +72,14 @@ class TokenID(BaseSchema):
         ...,
         description="Token expiration time in seconds",
     )
+
+
+class TokenBatchItem(BaseSchema):
+    token_id: TokenID | None = Field(None, description="Created token, if the item succeeded")
+    error: ErrorResponse | None = Field(None, description="Item error, if the item failed")
+
+
+class TokenLookupResult(BaseSchema):
+    tokens: dict[str, Token] = Field(default_factory=dict[str, Token], description="Found tokens by token ID")
+    not_found: list[str] = Field(default_factory=list[str], description="Token IDs not found or expired")
+    invalid: list[str] = Field(default_factory=list[str], description="Malformed token IDs")
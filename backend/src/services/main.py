@@ -1,15 +1,89 @@
+from abc import ABC
+from abc import abstractmethod
+from asyncio import CancelledError
+from asyncio import Task
+from asyncio import create_task
+from asyncio import sleep
+from contextlib import suppress
+from time import perf_counter
+from time import time
+from typing import Any
+
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from src.core.log import BaseClass
+from src.core.log import logger
+
 
 class DBSessionMixin:
     def __init__(self, session: AsyncSession):
         self.session = session
 
 
-class AppService(DBSessionMixin):
-    pass
-
-
 class AppCRUD(DBSessionMixin):
     async def save(self) -> None:
         await self.session.commit()
+
+
+class PeriodicTask(BaseClass, ABC):
+    def __init__(self, service_name: str, interval_seconds: float):
+        """Initialize a background task that calls ``run_once`` every ``interval_seconds``.
+
+        Args:
+            service_name (str): Name used for the asyncio task and the log context.
+            interval_seconds (float): Pause between two runs.
+        """
+        self._SERVICE_NAME = service_name
+
+        self.interval_seconds = interval_seconds
+
+        self._task: Task[None] | None = None
+
+        self.runs = 0
+        self.errors = 0
+        self.last_run_at: float | None = None
+        self.last_run_duration_ms: float | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = create_task(self._run(), name=self._SERVICE_NAME)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(CancelledError):
+            await self._task
+        self._task = None
+
+    @abstractmethod
+    async def run_once(self) -> Any:
+        """Run one iteration of the task; exceptions are logged and counted in ``errors``."""
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self._task is not None,
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at,
+            "last_run_duration_ms": self.last_run_duration_ms,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            self.last_run_at = time()
+            start_time = perf_counter()
+
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.errors += 1
+                with self.get_log_context("run"):
+                    logger.error("Periodic task failed", error=str(e), error_type=type(e).__name__)
+            else:
+                self.runs += 1
+
+            self.last_run_duration_ms = round((perf_counter() - start_time) * 1000, 2)
+
+            await sleep(self.interval_seconds)
@@ -0,0 +1,47 @@
+from typing import Any
+
+from src.core.config import settings
+from src.core.database import database
+from src.core.log import logger
+from src.core.partitions import create_partitions
+from src.core.partitions import drop_expired_partitions
+from src.services.main import PeriodicTask
+
+
+class TokenPartitionMaintainer(PeriodicTask):
+    def __init__(self, interval_seconds: float):
+        """Initialize the background maintainer of ``tokens`` range partitions.
+
+        Args:
+            interval_seconds (float): Pause between two maintenance runs.
+        """
+        super().__init__("token_partition_maintainer", interval_seconds)
+
+        self.partitions_created = 0
+        self.partitions_dropped = 0
+
+    async def run_once(self) -> None:
+        """Pre-create upcoming partitions and drop the fully expired ones."""
+        async with database.engine.begin() as conn:
+            await database.lock_schema(conn)
+            created = await create_partitions(conn)
+            dropped = await drop_expired_partitions(conn)
+
+        self.partitions_created += len(created)
+        self.partitions_dropped += len(dropped)
+
+        if created or dropped:
+            with self.get_log_context("run_once"):
+                logger.info("Token partitions maintained", created=created, dropped=dropped)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "partitions_created": self.partitions_created,
+            "partitions_dropped": self.partitions_dropped,
+        }
+
+
+token_partition_maintainer = TokenPartitionMaintainer(
+    interval_seconds=settings.TOKEN_PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+)
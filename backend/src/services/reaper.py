@@ -0,0 +1,58 @@
+from typing import Any
+
+from src.core.config import settings
+from src.core.log import logger
+from src.services.main import PeriodicTask
+from src.services.storage import token_repository
+
+
+class TokenReaper(PeriodicTask):
+    def __init__(self, interval_seconds: float, batch_size: int):
+        """Initialize the background deleter of expired tokens.
+
+        Args:
+            interval_seconds (float): Pause between two reaping runs.
+            batch_size (int): Maximum number of tokens deleted per transaction.
+        """
+        super().__init__("token_reaper", interval_seconds)
+
+        self.batch_size = batch_size
+
+        self.tokens_reclaimed = 0
+
+    async def run_once(self) -> int:
+        """Delete expired tokens in batches until no full batch is left.
+
+        Returns:
+            int: Number of deleted tokens.
+        """
+        tokens_reclaimed = 0
+
+        while True:
+            async with token_repository() as repository:
+                deleted = await repository.delete_expired(self.batch_size)
+
+            tokens_reclaimed += deleted
+
+            if deleted < self.batch_size:
+                break
+
+        self.tokens_reclaimed += tokens_reclaimed
+
+        if tokens_reclaimed:
+            with self.get_log_context("run_once"):
+                logger.info("Expired tokens reclaimed", tokens=tokens_reclaimed)
+
+        return tokens_reclaimed
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "tokens_reclaimed": self.tokens_reclaimed,
+        }
+
+
+token_reaper = TokenReaper(
+    interval_seconds=settings.TOKEN_REAPER_INTERVAL_SECONDS,
+    batch_size=settings.TOKEN_REAPER_BATCH_SIZE,
+)
@@ -0,0 +1,113 @@
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Sequence
+from datetime import datetime
+from operator import methodcaller
+from typing import Any
+
+from src.core.config import settings
+from src.core.database import DATABASE_ERRORS
+from src.core.replicas import Replica
+from src.core.replicas import ReplicaSet
+from src.core.replicas import replica_set
+from src.repositories.base import StoredToken
+from src.repositories.base import TokenRepository
+from src.schemas.token import Token as TokenSchema
+from src.services.main import PeriodicTask
+from src.services.tokens import database_token_repository
+
+
+class ReplicaMonitor(PeriodicTask):
+    def __init__(self, replicas: ReplicaSet, interval_seconds: float):
+        """Initialize the background health and replication lag check of read replicas.
+
+        Args:
+            replicas (ReplicaSet): Replicas to check.
+            interval_seconds (float): Pause between two checks.
+        """
+        super().__init__("replica_monitor", interval_seconds)
+
+        self.replicas = replicas
+
+    async def run_once(self) -> int:
+        return await self.replicas.check()
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), **self.replicas.stats()}
+
+
+class ReplicaTokenRepository(TokenRepository):
+    """Reads tokens from a replica and sends everything else to ``repository`` on the primary.
+
+    Tokens a replica does not return are looked up on the primary, so a token read
+    right after its creation is found even before it is replicated. Replicas lagging
+    more than ``DATABASE_REPLICA_MAX_LAG_SECONDS`` are not used, which bounds how long
+    a consumed token can still be read.
+    """
+
+    def __init__(self, repository: TokenRepository, replicas: ReplicaSet):
+        self.repository = repository
+        self.replicas = replicas
+
+    async def create_tokens(self, tokens: Sequence[TokenSchema], expires_at: datetime) -> list[int]:
+        return await self.repository.create_tokens(tokens, expires_at)
+
+    async def get_token(self, token_id: int) -> StoredToken | None:
+        return await self._get(methodcaller("get_token", token_id))
+
+    async def get_refresh_token(self, token_id: int) -> StoredToken | None:
+        return await self._get(methodcaller("get_refresh_token", token_id))
+
+    async def get_token_expiry(self, token_id: int) -> datetime | None:
+        return await self._get(methodcaller("get_token_expiry", token_id))
+
+    async def get_tokens(self, token_ids: Sequence[int]) -> dict[int, bytes]:
+        replica = self.replicas.choose()
+        tokens: dict[int, bytes] = {}
+        if replica is not None:
+            tokens = await self._get_replica_tokens(replica, token_ids)
+
+        if missing := [token_id for token_id in token_ids if token_id not in tokens]:
+            self.replicas.primary_fallbacks += 1
+            tokens.update(await self.repository.get_tokens(missing))
+
+        return tokens
+
+    async def consume_token(self, token_id: int) -> bytes | None:
+        return await self.repository.consume_token(token_id)
+
+    async def delete_expired(self, batch_size: int) -> int:
+        return await self.repository.delete_expired(batch_size)
+
+    async def _get[T](self, read: Callable[[TokenRepository], Awaitable[T | None]]) -> T | None:
+        replica = self.replicas.choose()
+        if replica is not None:
+            try:
+                async with replica.session_factory() as session:
+                    result = await read(database_token_repository(session, replica.engine))
+            except DATABASE_ERRORS as e:
+                self.replicas.mark_failed(replica, e)
+            else:
+                replica.reads += 1
+                if result is not None:
+                    return result
+
+        self.replicas.primary_fallbacks += 1
+        return await read(self.repository)
+
+    async def _get_replica_tokens(self, replica: Replica, token_ids: Sequence[int]) -> dict[int, bytes]:
+        try:
+            async with replica.session_factory() as session:
+                tokens = await database_token_repository(session, replica.engine).get_tokens(token_ids)
+        except DATABASE_ERRORS as e:
+            self.replicas.mark_failed(replica, e)
+            return {}
+
+        replica.reads += 1
+        return tokens
+
+
+replica_monitor = ReplicaMonitor(
+    replicas=replica_set,
+    interval_seconds=settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS,
+)
@@ -0,0 +1,34 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.core.config import TokenStorageBackend
+from src.core.config import settings
+from src.core.database import database
+from src.core.replicas import replica_set
+from src.repositories.base import TokenRepository
+from src.repositories.memory import memory_token_repository
+from src.services.replicas import ReplicaTokenRepository
+from src.services.tokens import database_token_repository
+from src.services.write_buffer import BufferedTokenRepository
+from src.services.write_buffer import token_write_buffer
+
+
+@asynccontextmanager
+async def token_repository() -> AsyncIterator[TokenRepository]:
+    """Open the token storage backend selected by ``TOKEN_STORAGE_BACKEND``."""
+    if settings.TOKEN_STORAGE_BACKEND is TokenStorageBackend.MEMORY:
+        yield memory_token_repository
+        return
+
+    async with database.session_factory() as session:
+        repository: TokenRepository = database_token_repository(session)
+        if replica_set.replicas:
+            repository = ReplicaTokenRepository(repository, replica_set)
+        if settings.TOKEN_WRITE_BUFFER_ENABLED:
+            repository = BufferedTokenRepository(repository, token_write_buffer)
+        yield repository
+
+
+async def get_token_repository() -> AsyncIterator[TokenRepository]:
+    async with token_repository() as repository:
+        yield repository
@@ -1,36 +1,64 @@
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Sequence
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
+from typing import Any
 
+from pydantic import ValidationError
+from sqlalchemy import ARRAY
+from sqlalchemy import Integer
+from sqlalchemy import any_
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from src.core.config import TokenDataAccess
+from src.core.config import TokenStorageMode
 from src.core.config import settings
+from src.core.database import DATABASE_ERRORS
+from src.core.database import database
+from src.core.log import logger
 from src.models.token import Token as TokenModel
+from src.repositories.base import StoredToken
+from src.repositories.base import TokenRepository
+from src.repositories.postgres import AsyncpgTokenRepository
+from src.repositories.rows import token_rows
+from src.schemas.token import RefreshToken as RefreshTokenSchema
 from src.schemas.token import Token as TokenSchema
+from src.schemas.token import TokenBatchItem
 from src.schemas.token import TokenID
 from src.services.main import AppCRUD
-from src.services.main import AppService
-from src.utils import pydantic_to_sqlalchemy
 from src.utils.app_exceptions import TokenException
+from src.utils.cache import token_cache
 from src.utils.encrypting import UUIDGeneratorError
 from src.utils.encrypting import uuid_generator
+from src.utils.projection import FieldProjection
+from src.utils.responses import dumps
+from src.utils.responses import json_object
 from src.utils.service_result import ServiceResult
 from src.utils.service_result import error
 from src.utils.service_result import handle_result
 from src.utils.service_result import success
 
 
-class TokenService(AppService):
+class TokenService:
+    def __init__(self, repository: TokenRepository):
+        self.repository = repository
+
     @handle_result
     async def create_token(self, token: TokenSchema) -> ServiceResult[TokenID]:
         try:
             expires_at = datetime.now(UTC) + timedelta(
                 seconds=settings.TOKEN_EXPIRES_SECONDS,
             )
-            created_token = await TokenCRUD(self.session).create_token(
-                token,
-                expires_at,
-            )
+            (created_token,) = await self.repository.create_tokens([token], expires_at)
             token_id = TokenID(
                 token_id=uuid_generator.int_to_uuid(created_token),
                 expires_at=expires_at,
@@ -47,7 +75,54 @@ class TokenService(AppService):
         return success(token_id)
 
     @handle_result
-    async def get_token(self, token_id: str) -> ServiceResult[TokenSchema]:
+    async def create_tokens(self, tokens: list[dict[str, Any]]) -> ServiceResult[list[TokenBatchItem]]:
+        items = [TokenBatchItem() for _ in tokens]
+        valid_tokens: list[tuple[int, TokenSchema]] = []
+
+        for index, payload in enumerate(tokens):
+            try:
+                valid_tokens.append((index, TokenSchema.model_validate(payload)))
+            except ValidationError as e:
+                items[index].error = TokenException.TokenValidationError(
+                    details={"index": index, "errors": e.errors(include_url=False, include_context=False)},
+                ).to_response_model()
+
+        if not valid_tokens:
+            return success(items)
+
+        expires_at = datetime.now(UTC) + timedelta(
+            seconds=settings.TOKEN_EXPIRES_SECONDS,
+        )
+
+        try:
+            created_tokens = await self.repository.create_tokens(
+                [token for _, token in valid_tokens],
+                expires_at,
+            )
+        except Exception as e:
+            logger.error("Batch token creation failed", count=len(valid_tokens), error=str(e))
+            create_error = TokenException.TokenCreateError(details={"error": str(e)}).to_response_model()
+            for index, _ in valid_tokens:
+                items[index].error = create_error
+            return success(items)
+
+        for (index, _), created_token in zip(valid_tokens, created_tokens, strict=True):
+            items[index].token_id = TokenID(
+                token_id=uuid_generator.int_to_uuid(created_token),
+                expires_at=expires_at,
+                token_expires_seconds=settings.TOKEN_EXPIRES_SECONDS,
+            )
+
+        return success(items)
+
+    @handle_result
+    async def get_token(
+        self,
+        token_id: str,
+        *,
+        consume: bool = False,
+        fields: FieldProjection | None = None,
+    ) -> ServiceResult[StoredToken]:
         try:
             id = uuid_generator.uuid_to_int(token_id)
 
@@ -58,36 +133,583 @@ class TokenService(AppService):
                 ),
             )
 
-        token_model = await TokenCRUD(self.session).get_item(id)
+        if consume:
+            result = await self._consume_token(id, token_id)
+        elif fields is not None and fields.refresh_token_only:
+            result = await self._read_token(id, token_id, self.repository.get_refresh_token, cache=False)
+        else:
+            result = await self._read_token(id, token_id, self.repository.get_token, cache=True)
+
+        if fields is None or result.is_error():
+            return result
 
-        if not token_model:
+        return ServiceResult(StoredToken(fields.apply(result.value.content), result.value.expires_at))
+
+    async def _read_token(
+        self,
+        id: int,
+        token_id: str,
+        read: Callable[[int], Awaitable[StoredToken | None]],
+        *,
+        cache: bool,
+    ) -> ServiceResult[StoredToken]:
+        async def read_and_cache(id: int) -> StoredToken | None:
+            stored_token = await read(id)
+            if cache and stored_token:
+                token_cache.set(id, stored_token.content, stored_token.expires_at)
+            return stored_token
+
+        stored_token = await self._read_through_cache(id, read_and_cache, lambda cached_token: cached_token)
+        if not stored_token:
             return ServiceResult(
                 TokenException.TokenNotFoundError(details={"token_id": str(token_id)}),
             )
 
-        return ServiceResult(TokenSchema.model_validate(token_model))
+        return ServiceResult(stored_token)
 
+    async def _read_through_cache[T](
+        self,
+        id: int,
+        read: Callable[[int], Awaitable[T | None]],
+        from_cache: Callable[[StoredToken], T],
+    ) -> T | None:
+        """Answer from the token cache, otherwise with ``read``.
 
-class TokenCRUD(AppCRUD):
-    async def create_token(self, token: TokenSchema, expires_at: datetime) -> int:
-        db_token = pydantic_to_sqlalchemy(token, TokenModel)
-        db_token.expires_at = expires_at
+        When ``read`` fails with a database error and ``TOKEN_CACHE_STALE_IF_ERROR`` is
+        enabled, a cached token past its max age but not yet expired is used instead.
 
-        self.session.add(db_token)
+        Args:
+            id (int): Internal token ID.
+            read (Callable[[int], Awaitable[T | None]]): Repository read of the token.
+            from_cache (Callable[[StoredToken], T]): Conversion of a cached token into the result.
 
-        await self.save()
-        await self.session.refresh(db_token)
+        Returns:
+            T | None: Result, or ``None`` if the token does not exist or has expired.
+        """
+        cached_token = token_cache.get(id)
+        if cached_token is not None:
+            return from_cache(cached_token)
 
-        return db_token.id
+        try:
+            return await read(id)
+        except DATABASE_ERRORS as e:
+            stale_token = token_cache.get_stale(id) if settings.TOKEN_CACHE_STALE_IF_ERROR else None
+            if stale_token is None:
+                raise
+            logger.warning("Serving cached token during database error", error=str(e))
+            return from_cache(stale_token)
 
-    async def get_item(self, token_id: int) -> TokenModel | None:
-        now = datetime.now(UTC)
-        return (
-            await self.session.scalars(
-                select(TokenModel).where(
-                    TokenModel.id == token_id,
-                    TokenModel.expires_at > now,
-                    TokenModel.time_to_refresh > now,
+    async def _consume_token(self, id: int, token_id: str) -> ServiceResult[StoredToken]:
+        token_cache.discard(id)
+
+        content = await self.repository.consume_token(id)
+        if content is None:
+            return ServiceResult(
+                TokenException.TokenNotFoundError(details={"token_id": str(token_id)}),
+            )
+
+        return ServiceResult(StoredToken(content, datetime.now(UTC)))
+
+    @handle_result
+    async def get_token_expiry(self, token_id: str) -> ServiceResult[datetime]:
+        """Return when a token stops being valid without loading it.
+
+        Served from the token cache when possible, otherwise with an index-only
+        query of the repository.
+        """
+        try:
+            id = uuid_generator.uuid_to_int(token_id)
+
+        except UUIDGeneratorError as e:
+            return ServiceResult(
+                TokenException.TokenValidationError(
+                    details={"token_id": token_id, "error": str(e)},
                 ),
             )
+
+        expires_at = await self._read_through_cache(
+            id,
+            self.repository.get_token_expiry,
+            lambda cached_token: cached_token.expires_at,
+        )
+        if expires_at is None:
+            return ServiceResult(
+                TokenException.TokenNotFoundError(details={"token_id": str(token_id)}),
+            )
+
+        return ServiceResult(expires_at)
+
+    @handle_result
+    async def get_tokens(self, token_ids: list[str]) -> ServiceResult[bytes]:
+        """Look up several tokens and encode the ``TokenLookupResult`` body.
+
+        Found tokens are spliced into the body as their stored response bytes.
+        """
+        ids: dict[str, int] = {}
+        invalid: list[str] = []
+
+        for token_id in token_ids:
+            try:
+                ids[token_id] = uuid_generator.uuid_to_int(token_id)
+            except UUIDGeneratorError:
+                invalid.append(token_id)
+
+        tokens = await self.repository.get_tokens(list(set(ids.values()))) if ids else {}
+        found: dict[str, bytes] = {}
+        not_found: list[str] = []
+
+        for token_id, id in ids.items():
+            if id in tokens:
+                found[token_id] = tokens[id]
+            else:
+                not_found.append(token_id)
+
+        return ServiceResult(
+            json_object({"tokens": json_object(found), "not_found": dumps(not_found), "invalid": dumps(invalid)}),
+        )
+
+
+def database_token_repository(
+    session: AsyncSession,
+    engine: AsyncEngine | None = None,
+) -> "TokenCRUD | AsyncpgTokenRepository":
+    """Open the token repository of ``TOKEN_DATA_ACCESS`` on a database.
+
+    Args:
+        session (AsyncSession): Session of the ORM repository.
+        engine (AsyncEngine | None, optional): Engine of the asyncpg fast path. Defaults to
+            ``database.engine``.
+    """
+    repository = TokenCRUD(session)
+    if settings.TOKEN_DATA_ACCESS is TokenDataAccess.ASYNCPG:
+        return AsyncpgTokenRepository(repository, engine)
+    return repository
+
+
+async def migrate_token_storage() -> None:
+    if settings.TOKEN_STORAGE_MODE is not TokenStorageMode.DOCUMENT:
+        return
+
+    async with database.session_factory() as session:
+        migrated = await TokenCRUD(session).migrate_to_documents()
+
+    if migrated:
+        logger.info("Migrated tokens to document storage", migrated=migrated)
+
+
+class TokenCRUD(AppCRUD, TokenRepository):
+    async def create_tokens(
+        self,
+        tokens: Sequence[TokenSchema],
+        expires_at: datetime | Sequence[datetime],
+        *,
+        durable: bool = True,
+    ) -> list[int]:
+        """Insert tokens in one transaction and commit it.
+
+        Args:
+            tokens (Sequence[TokenSchema]): Validated tokens to insert.
+            expires_at (datetime | Sequence[datetime]): Expiration time shared by all tokens or one per token.
+            durable (bool, optional): When disabled, PostgreSQL acknowledges the commit before
+                its WAL record is flushed to disk (``synchronous_commit = off``).
+
+        Returns:
+            list[int]: IDs of the inserted tokens in the order of ``tokens``.
+        """
+        async with database.writer():
+            if not durable and not database.is_sqlite:
+                await self.session.execute(text("SET LOCAL synchronous_commit = off"))
+
+            token_ids = await self.insert_tokens(tokens, expires_at)
+
+            await self.save()
+
+        return token_ids
+
+    async def insert_tokens(
+        self,
+        tokens: Sequence[TokenSchema],
+        expires_at: datetime | Sequence[datetime],
+    ) -> list[int]:
+        """Insert whole token graphs with one multi-row statement per table.
+
+        The canonical response JSON of every token is stored next to its row so that
+        reads can return it verbatim. In document storage mode that JSON is the only
+        copy of the users tree and no other table is touched; ``users_document`` is
+        only filled for older tokens by ``migrate_to_documents``. Otherwise
+        ``token_rows`` collects the rows of all tables in one walk over the tokens, and
+        the tables are inserted parents first using ``INSERT ... RETURNING id`` with
+        parameter order preserved (leaf tables without ``RETURNING``), so the number of
+        round trips does not depend on the payload size. The caller is responsible for
+        committing the transaction.
+
+        Args:
+            tokens (Sequence[TokenSchema]): Validated tokens to insert.
+            expires_at (datetime | Sequence[datetime]): Expiration time shared by all tokens or one per token.
+
+        Returns:
+            list[int]: IDs of the inserted tokens in the order of ``tokens``.
+        """
+        expirations = [expires_at] * len(tokens) if isinstance(expires_at, datetime) else expires_at
+
+        token_ids = await self._insert_rows(
+            TokenModel,
+            [
+                {
+                    "refresh_token": token.refresh_token,
+                    "time_to_refresh": token.time_to_refresh,
+                    "response_json": token.model_dump_json().encode(),
+                    "expires_at": token_expires_at,
+                }
+                for token, token_expires_at in zip(tokens, expirations, strict=True)
+            ],
+        )
+
+        if settings.TOKEN_STORAGE_MODE is TokenStorageMode.DOCUMENT:
+            return token_ids
+
+        tables = token_rows.convert(tokens)
+        tables[0].ids = token_ids
+
+        for table in tables[1:]:
+            table.ids = await self._insert_rows(table.model, table.rows(), with_ids=not table.is_leaf)
+
+        return tables[0].ids
+
+    async def _insert_rows(
+        self,
+        model: type[database.Base],
+        rows: list[dict[str, Any]],
+        *,
+        with_ids: bool = True,
+    ) -> list[int]:
+        if not rows:
+            return []
+        if not with_ids:
+            await self.session.execute(insert(model), rows)
+            return []
+
+        result = await self.session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows,
+        )
+
+        return list(result)
+
+    async def get_token(self, token_id: int) -> StoredToken | None:
+        """Fetch the serialized response of a live token.
+
+        Tokens store their canonical response JSON at creation time, so this is a
+        single-row lookup. Tokens created before that was introduced are rebuilt
+        from the document or normalized storage.
+
+        Args:
+            token_id (int): Internal token ID.
+
+        Returns:
+            StoredToken | None: Response bytes and the time the token stops being valid.
+        """
+        row = (
+            await self.session.execute(
+                select(
+                    TokenModel.response_json,
+                    TokenModel.expires_at,
+                    TokenModel.time_to_refresh,
+                ).where(*self._live_token(token_id)),
+            )
+        ).first()
+
+        if not row:
+            return None
+
+        content = row.response_json
+        if content is None:
+            tokens = await self._load_tokens([token_id])
+            if token_id not in tokens:
+                return None
+            content = tokens[token_id].model_dump_json().encode()
+
+        return StoredToken(content, min(row.expires_at, row.time_to_refresh))
+
+    async def get_refresh_token(self, token_id: int) -> StoredToken | None:
+        """Fetch the ``RefreshToken`` fields of a live token.
+
+        Only scalar columns of the token row are read; neither the stored response
+        nor the users are loaded.
+
+        Args:
+            token_id (int): Internal token ID.
+
+        Returns:
+            StoredToken | None: Serialized ``RefreshToken`` and the time the token stops being valid.
+        """
+        row = (
+            await self.session.execute(
+                select(
+                    TokenModel.refresh_token,
+                    TokenModel.time_to_refresh,
+                    TokenModel.expires_at,
+                ).where(*self._live_token(token_id)),
+            )
+        ).first()
+
+        if not row:
+            return None
+
+        return StoredToken(
+            RefreshTokenSchema.model_construct(
+                refresh_token=row.refresh_token,
+                time_to_refresh=row.time_to_refresh,
+            )
+            .model_dump_json()
+            .encode(),
+            min(row.expires_at, row.time_to_refresh),
+        )
+
+    async def get_token_expiry(self, token_id: int) -> datetime | None:
+        """Fetch when a live token stops being valid.
+
+        Only ``id``, ``expires_at`` and ``time_to_refresh`` are read, which the
+        ``ix_tokens_id_expires_at_time_to_refresh`` index covers, so the token row and
+        its subtree are not loaded.
+
+        Args:
+            token_id (int): Internal token ID.
+
+        Returns:
+            datetime | None: The earlier of ``expires_at`` and ``time_to_refresh``, or
+                ``None`` if the token does not exist or has expired.
+        """
+        row = (
+            await self.session.execute(
+                select(TokenModel.expires_at, TokenModel.time_to_refresh).where(*self._live_token(token_id)),
+            )
+        ).first()
+
+        return min(row.expires_at, row.time_to_refresh) if row else None
+
+    async def consume_token(self, token_id: int) -> bytes | None:
+        """Atomically fetch and delete a live token.
+
+        The token row is removed with ``DELETE ... RETURNING`` and its normalized
+        subtree goes with it through ``ON DELETE CASCADE``, so a token can be
+        consumed only once. In normalized storage mode tokens without stored
+        response JSON are rebuilt before they are deleted.
+
+        Args:
+            token_id (int): Internal token ID.
+
+        Returns:
+            bytes | None: Serialized token, or ``None`` if it does not exist or has expired.
+        """
+        async with database.writer():
+            content = await self._delete_token(token_id)
+            if content is not None:
+                await self.save()
+
+        return content
+
+    async def _delete_token(self, token_id: int) -> bytes | None:
+        conditions = self._live_token(token_id)
+        if settings.TOKEN_STORAGE_MODE is not TokenStorageMode.DOCUMENT:
+            conditions = (*conditions, TokenModel.response_json.is_not(None))
+
+        row = (
+            await self.session.execute(
+                delete(TokenModel)
+                .where(*conditions)
+                .returning(
+                    TokenModel.response_json,
+                    TokenModel.refresh_token,
+                    TokenModel.time_to_refresh,
+                    TokenModel.users_document,
+                )
+                .execution_options(synchronize_session=False),
+            )
         ).first()
+
+        if row is not None:
+            content = row.response_json or self._to_schema(row).model_dump_json().encode()  # type: ignore
+        elif settings.TOKEN_STORAGE_MODE is not TokenStorageMode.DOCUMENT:
+            tokens = await self._load_tokens([token_id])
+            if token_id not in tokens:
+                return None
+
+            await self.session.execute(
+                delete(TokenModel).where(TokenModel.id == token_id).execution_options(synchronize_session=False),
+            )
+            content = tokens[token_id].model_dump_json().encode()
+        else:
+            return None
+
+        return content
+
+    async def get_tokens(self, token_ids: Sequence[int]) -> dict[int, bytes]:
+        """Fetch the serialized responses of several live tokens with a single ``id = ANY(...)`` query.
+
+        Stored responses are returned as they are; only tokens created before responses
+        were stored are rebuilt from the document or normalized storage.
+
+        Args:
+            token_ids (Sequence[int]): Internal token IDs.
+
+        Returns:
+            dict[int, bytes]: Response bytes by ID; missing and expired IDs are absent.
+        """
+        rows = (
+            await self.session.execute(
+                select(TokenModel.id, TokenModel.response_json).where(*self._live_tokens(token_ids)),
+            )
+        ).all()
+
+        tokens = {row.id: row.response_json for row in rows if row.response_json is not None}
+        pending = [row.id for row in rows if row.response_json is None]
+
+        if pending:
+            tokens.update(
+                (token_id, token.model_dump_json().encode())
+                for token_id, token in (await self._load_tokens(pending)).items()
+            )
+
+        return tokens
+
+    async def _load_tokens(self, token_ids: Sequence[int]) -> dict[int, TokenSchema]:
+        tokens: dict[int, TokenSchema] = {}
+        pending = token_ids
+
+        if settings.TOKEN_STORAGE_MODE is TokenStorageMode.DOCUMENT:
+            rows = (
+                await self.session.execute(
+                    select(
+                        TokenModel.id,
+                        TokenModel.refresh_token,
+                        TokenModel.time_to_refresh,
+                        TokenModel.users_document,
+                    ).where(*self._live_tokens(token_ids)),
+                )
+            ).all()
+
+            tokens = {row.id: self._to_schema(row) for row in rows if row.users_document is not None}  # type: ignore
+            pending = [row.id for row in rows if row.users_document is None]
+
+            if not pending:
+                return tokens
+
+        token_models = (await self.session.scalars(select(TokenModel).where(*self._live_tokens(pending)))).unique()
+        tokens.update({token_model.id: self._to_schema(token_model) for token_model in token_models})
+
+        return tokens
+
+    async def migrate_to_documents(self, batch_size: int = 500) -> int:
+        """Copy live normalized tokens into the ``users_document`` column.
+
+        Tokens stored before document mode was enabled keep their rows in the
+        normalized tables; this backfills their documents so that reads only touch
+        ``tokens``. Already migrated and expired tokens are skipped, as are tokens
+        with stored response JSON, which is read instead.
+
+        Args:
+            batch_size (int, optional): Number of tokens loaded and committed at once.
+
+        Returns:
+            int: Number of migrated tokens.
+        """
+        migrated = 0
+
+        async with database.writer():
+            while True:
+                await database.lock_schema(self.session)
+
+                token_models = (
+                    (
+                        await self.session.scalars(
+                            select(TokenModel)
+                            .where(
+                                TokenModel.users_document.is_(None),
+                                TokenModel.response_json.is_(None),
+                                TokenModel.expires_at > datetime.now(UTC),
+                            )
+                            .order_by(TokenModel.id)
+                            .limit(batch_size),
+                        )
+                    )
+                    .unique()
+                    .all()
+                )
+
+                if not token_models:
+                    return migrated
+
+                for token_model in token_models:
+                    token_model.users_document = [
+                        user.model_dump(mode="json") for user in TokenSchema.model_validate(token_model).users
+                    ]
+
+                await self.save()
+                migrated += len(token_models)
+
+    async def delete_expired(self, batch_size: int) -> int:
+        """Delete one batch of expired tokens.
+
+        Expired token rows are locked with ``FOR UPDATE SKIP LOCKED`` so that several
+        replicas can reap concurrently without waiting on each other; the dependent
+        rows are removed by ``ON DELETE CASCADE``.
+
+        Args:
+            batch_size (int): Maximum number of tokens deleted.
+
+        Returns:
+            int: Number of deleted tokens.
+        """
+        now = datetime.now(UTC)
+        expired_ids = (
+            select(TokenModel.id)
+            .where(or_(TokenModel.expires_at <= now, TokenModel.time_to_refresh <= now))
+            .order_by(TokenModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        async with database.writer():
+            result = await self.session.execute(
+                delete(TokenModel).where(TokenModel.id.in_(expired_ids)).execution_options(synchronize_session=False),
+            )
+
+            await self.save()
+
+        return result.rowcount  # type: ignore
+
+    @staticmethod
+    def _to_schema(token_model: TokenModel) -> TokenSchema:
+        if token_model.users_document is not None:
+            return TokenSchema(
+                refresh_token=token_model.refresh_token,
+                time_to_refresh=token_model.time_to_refresh,
+                users=token_model.users_document,  # type: ignore
+            )
+
+        return TokenSchema.model_validate(token_model)
+
+    @staticmethod
+    def _live_token(token_id: int) -> tuple[Any, ...]:
+        now = datetime.now(UTC)
+        return (
+            TokenModel.id == token_id,
+            TokenModel.expires_at > now,
+            TokenModel.time_to_refresh > now,
+        )
+
+    @staticmethod
+    def _id_in(token_ids: Sequence[int]) -> Any:
+        if database.is_sqlite:
+            return TokenModel.id.in_(list(token_ids))
+        return TokenModel.id == any_(literal(list(token_ids), ARRAY(Integer)))
+
+    @staticmethod
+    def _live_tokens(token_ids: Sequence[int]) -> tuple[Any, ...]:
+        now = datetime.now(UTC)
+        return (
+            TokenCRUD._id_in(token_ids),
+            TokenModel.expires_at > now,
+            TokenModel.time_to_refresh > now,
+        )
@@ -0,0 +1,162 @@
+from asyncio import Future
+from asyncio import Task
+from asyncio import TimerHandle
+from asyncio import create_task
+from asyncio import gather
+from asyncio import get_running_loop
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from src.core.config import WriteDurability
+from src.core.config import settings
+from src.core.database import database
+from src.core.log import BaseClass
+from src.core.log import logger
+from src.repositories.base import StoredToken
+from src.repositories.base import TokenRepository
+from src.schemas.token import Token as TokenSchema
+from src.services.tokens import database_token_repository
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    tokens: Sequence[TokenSchema]
+    expires_at: datetime
+    future: Future[list[int]]
+
+
+class TokenWriteBuffer(BaseClass):
+    def __init__(self, max_delay_ms: float, max_batch: int, durability: WriteDurability):
+        """Initialize a group-commit buffer for token inserts.
+
+        Concurrent ``submit`` calls are collected for up to ``max_delay_ms`` or until
+        ``max_batch`` tokens are pending, then written with a single transaction and
+        commit; every caller gets the IDs of its own tokens.
+
+        Args:
+            max_delay_ms (float): Longest time a token waits for its batch to be written.
+            max_batch (int): Number of pending tokens that triggers an immediate write.
+            durability (WriteDurability): ``relaxed`` commits batches with
+                ``synchronous_commit = off`` on PostgreSQL.
+        """
+        self._SERVICE_NAME = "token_write_buffer"
+
+        self.max_delay_seconds = max_delay_ms / 1000
+        self.max_batch = max_batch
+        self.durable = durability is WriteDurability.DURABLE
+
+        self._pending: list[PendingWrite] = []
+        self._pending_tokens = 0
+        self._timer: TimerHandle | None = None
+        self._flushes: set[Task[None]] = set()
+
+        self.batches = 0
+        self.tokens_written = 0
+        self.largest_batch = 0
+        self.errors = 0
+
+    async def submit(self, tokens: Sequence[TokenSchema], expires_at: datetime) -> list[int]:
+        future: Future[list[int]] = get_running_loop().create_future()
+        self._pending.append(PendingWrite(tokens, expires_at, future))
+        self._pending_tokens += len(tokens)
+
+        if self._pending_tokens >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = get_running_loop().call_later(self.max_delay_seconds, self._flush)
+
+        return await future
+
+    async def close(self) -> None:
+        """Write the pending tokens and wait for all running batches."""
+        self._flush()
+        await gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "tokens_written": self.tokens_written,
+            "largest_batch": self.largest_batch,
+            "errors": self.errors,
+            "pending_tokens": self._pending_tokens,
+        }
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        self._pending_tokens = 0
+
+        task = create_task(self._write(pending))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, pending: list[PendingWrite]) -> None:
+        tokens = [token for write in pending for token in write.tokens]
+        expirations = [write.expires_at for write in pending for _ in write.tokens]
+
+        try:
+            async with database.session_factory() as session:
+                repository = database_token_repository(session)
+                token_ids = await repository.create_tokens(tokens, expirations, durable=self.durable)
+        except Exception as e:
+            self.errors += 1
+            with self.get_log_context("write"):
+                logger.error("Buffered token write failed", tokens=len(tokens), error=str(e))
+            for write in pending:
+                if not write.future.done():
+                    write.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.tokens_written += len(tokens)
+        self.largest_batch = max(self.largest_batch, len(tokens))
+
+        offset = 0
+        for write in pending:
+            if not write.future.done():
+                write.future.set_result(token_ids[offset : offset + len(write.tokens)])
+            offset += len(write.tokens)
+
+
+class BufferedTokenRepository(TokenRepository):
+    """Sends creates through a ``TokenWriteBuffer`` and everything else to ``repository``."""
+
+    def __init__(self, repository: TokenRepository, buffer: TokenWriteBuffer):
+        self.repository = repository
+        self.buffer = buffer
+
+    async def create_tokens(self, tokens: Sequence[TokenSchema], expires_at: datetime) -> list[int]:
+        return await self.buffer.submit(tokens, expires_at)
+
+    async def get_token(self, token_id: int) -> StoredToken | None:
+        return await self.repository.get_token(token_id)
+
+    async def get_refresh_token(self, token_id: int) -> StoredToken | None:
+        return await self.repository.get_refresh_token(token_id)
+
+    async def get_token_expiry(self, token_id: int) -> datetime | None:
+        return await self.repository.get_token_expiry(token_id)
+
+    async def get_tokens(self, token_ids: Sequence[int]) -> dict[int, bytes]:
+        return await self.repository.get_tokens(token_ids)
+
+    async def consume_token(self, token_id: int) -> bytes | None:
+        return await self.repository.consume_token(token_id)
+
+    async def delete_expired(self, batch_size: int) -> int:
+        return await self.repository.delete_expired(batch_size)
+
+
+token_write_buffer = TokenWriteBuffer(
+    max_delay_ms=settings.TOKEN_WRITE_BUFFER_MAX_DELAY_MS,
+    max_batch=settings.TOKEN_WRITE_BUFFER_MAX_BATCH,
+    durability=settings.TOKEN_WRITE_BUFFER_DURABILITY,
+)
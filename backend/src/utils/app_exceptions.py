@@ -7,9 +7,9 @@ from fastapi import Request
 from fastapi import status
 from pydantic import BaseModel
 from pydantic import Field
-from starlette.responses import JSONResponse
 
 from src.core.log import logger
+from src.utils.responses import FastJSONResponse
 
 
 class ErrorSeverity(str, Enum):
@@ -91,7 +91,7 @@ class AppExceptionCase(Exception):  # noqa: N818
 async def app_exception_handler(
     request: Request,
     exc: AppExceptionCase,
-) -> JSONResponse:
+) -> FastJSONResponse:
     if exc.should_log:
         log_data: dict[str, Any] = {
             "error_code": exc.get_error_code(),
@@ -117,7 +117,7 @@ async def app_exception_handler(
 
     error_response = exc.to_response_model()
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content=error_response.model_dump(exclude_none=True),
     )
@@ -143,6 +143,36 @@ class TokenException:
         message = "Token not found or expired"
         severity = ErrorSeverity.LOW
 
+    class TokenFieldsError(AppExceptionCase):
+        status_code = status.HTTP_400_BAD_REQUEST
+        error_code = "TOKEN_FIELDS_INVALID"
+        message = "Requested token fields are invalid"
+        severity = ErrorSeverity.LOW
+        expose_details = True
+
+
+class RequestException:
+    class UnsupportedContentEncodingError(AppExceptionCase):
+        status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        error_code = "CONTENT_ENCODING_UNSUPPORTED"
+        message = "Request body content encoding is not supported"
+        severity = ErrorSeverity.LOW
+        expose_details = True
+
+    class InvalidRequestBodyError(AppExceptionCase):
+        status_code = status.HTTP_400_BAD_REQUEST
+        error_code = "CONTENT_ENCODING_INVALID"
+        message = "Request body could not be decompressed"
+        severity = ErrorSeverity.LOW
+        expose_details = True
+
+    class RequestBodyTooLargeError(AppExceptionCase):
+        status_code = status.HTTP_413_CONTENT_TOO_LARGE
+        error_code = "REQUEST_BODY_TOO_LARGE"
+        message = "Request body is too large"
+        severity = ErrorSeverity.MEDIUM
+        expose_details = True
+
 
 class ExceptionRegistry:
     _exceptions: ClassVar[dict[str, type[AppExceptionCase]]] = {}
@@ -168,10 +198,11 @@ class ExceptionRegistry:
         return cls._exceptions.get(error_code)
 
 
-for attr_name in dir(TokenException):
-    attr = getattr(TokenException, attr_name)
-    if isinstance(attr, type) and issubclass(attr, AppExceptionCase) and attr != AppExceptionCase:
-        ExceptionRegistry.register(attr)
+for exception_group in (TokenException, RequestException):
+    for attr_name in dir(exception_group):
+        attr = getattr(exception_group, attr_name)
+        if isinstance(attr, type) and issubclass(attr, AppExceptionCase) and attr != AppExceptionCase:
+            ExceptionRegistry.register(attr)
 
 
 def create_exception(
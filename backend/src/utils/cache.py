@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from time import time
+
+from src.core.config import settings
+from src.core.log import BaseClass
+from src.core.log import logger
+from src.repositories.base import StoredToken
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: bytes
+    expires_at: float
+    fresh_until: float
+
+    def to_stored_token(self) -> StoredToken:
+        return StoredToken(self.value, datetime.fromtimestamp(self.expires_at, UTC))
+
+
+class TokenCache(BaseClass):
+    ENTRY_OVERHEAD = 256
+
+    def __init__(self, max_bytes: int, max_age_seconds: int = 0, *, enabled: bool = True):
+        """Initialize a size-bounded LRU cache of serialized token responses.
+
+        Entries are dropped exactly at their token's expiration time and the least
+        recently used entries are evicted once ``max_bytes`` is exceeded.
+
+        Args:
+            max_bytes (int): Upper bound of the cached payload size (with per-entry overhead).
+            max_age_seconds (int, optional): How long an entry is served without asking the
+                database again; 0 means until the token expires. Entries older than this are
+                kept as stale copies for ``get_stale``.
+            enabled (bool, optional): When disabled, lookups always miss and nothing is stored.
+        """
+        self._SERVICE_NAME = "token_cache"
+
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+
+        self._entries: OrderedDict[int, CacheEntry] = OrderedDict()
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: int) -> StoredToken | None:
+        if not self.enabled:
+            return None
+
+        entry = self._get_entry(key)
+        if entry is None or entry.fresh_until <= time():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry.to_stored_token()
+
+    def get_stale(self, key: int) -> StoredToken | None:
+        """Return an entry that is past its max age but whose token has not expired yet."""
+        if not self.enabled:
+            return None
+
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+
+        self.stale_hits += 1
+        return entry.to_stored_token()
+
+    def set(self, key: int, value: bytes, expires_at: datetime) -> None:
+        if not self.enabled:
+            return
+
+        now = time()
+        expires_timestamp = expires_at.timestamp()
+        if expires_timestamp <= now:
+            return
+
+        self.discard(key)
+
+        size = len(value) + self.ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+
+        fresh_until = min(now + self.max_age_seconds, expires_timestamp) if self.max_age_seconds else expires_timestamp
+        self._entries[key] = CacheEntry(value=value, expires_at=expires_timestamp, fresh_until=fresh_until)
+        self._size += size
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.value) + self.ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def discard(self, key: int) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.value) + self.ENTRY_OVERHEAD
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _get_entry(self, key: int) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time():
+            self.discard(key)
+            self.expirations += 1
+            with self.get_log_context("expire"):
+                logger.trace("Token cache entry expired", key=key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+
+token_cache = TokenCache(
+    max_bytes=settings.TOKEN_CACHE_MAX_BYTES,
+    max_age_seconds=settings.TOKEN_CACHE_MAX_AGE_SECONDS,
+    enabled=settings.TOKEN_CACHE_ENABLED,
+)
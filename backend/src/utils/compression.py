@@ -0,0 +1,307 @@
+"""HTTP compression of request and response bodies.
+
+Responses are compressed with the first of ``COMPRESSION_ENCODINGS`` the client
+accepts once they reach ``COMPRESSION_MIN_SIZE`` bytes. Request bodies sent with
+``Content-Encoding: gzip`` (or ``zstd`` when the ``zstd`` extra is installed) are
+decompressed before they reach the routes, up to ``REQUEST_MAX_DECOMPRESSED_BYTES``.
+"""
+
+import zlib
+from collections.abc import Sequence
+from typing import Protocol
+
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from src.core.config import ContentEncoding
+from src.core.config import settings
+from src.utils.app_exceptions import AppExceptionCase
+from src.utils.app_exceptions import RequestException
+from src.utils.app_exceptions import app_exception_handler
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is an optional extra
+    zstandard = None
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+# zstd expands one input byte to at most ~32 KiB (a run-length block of 128 KiB is
+# 4 bytes), so feeding it (remaining output budget >> 15) bytes at a time keeps every
+# call within the budget; the minimum slice bounds the overshoot to ~2 MiB.
+ZSTD_EXPANSION_SHIFT = 15
+ZSTD_MIN_INPUT_CHUNK = 64
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/")
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    (zlib.error,) if zstandard is None else (zlib.error, zstandard.ZstdError)
+)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def supported_encodings() -> list[ContentEncoding]:
+    """Return the encodings this installation can decode and encode."""
+    if zstandard is None:
+        return [ContentEncoding.GZIP]
+    return [ContentEncoding.ZSTD, ContentEncoding.GZIP]
+
+
+def compressor(encoding: ContentEncoding) -> Compressor:
+    if encoding is ContentEncoding.ZSTD:
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()  # type: ignore[union-attr]
+    return zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+
+
+def decompress(encoding: str, body: bytes, max_size: int) -> bytes:
+    """Decompress a request body, giving up as soon as it exceeds ``max_size`` bytes.
+
+    The decompressed data is produced in bounded steps and joined once, so a
+    decompression bomb is stopped with at most about twice ``max_size`` bytes held.
+
+    Args:
+        encoding (str): ``Content-Encoding`` of the body.
+        body (bytes): Compressed body.
+        max_size (int): Largest accepted size of the decompressed body.
+
+    Raises:
+        RequestException.UnsupportedContentEncodingError: The encoding is not supported.
+        RequestException.RequestBodyTooLargeError: The decompressed body exceeds ``max_size``.
+        RequestException.InvalidRequestBodyError: The body is corrupt or truncated.
+
+    Returns:
+        bytes: Decompressed body.
+    """
+    try:
+        content_encoding = ContentEncoding(encoding.strip().lower())
+    except ValueError:
+        content_encoding = None
+    if content_encoding not in supported_encodings():
+        raise RequestException.UnsupportedContentEncodingError(
+            details={"content_encoding": encoding, "supported": [e.value for e in supported_encodings()]},
+        )
+
+    # The decompressors return ``None`` data once it exceeds ``max_size``
+    try:
+        if content_encoding is ContentEncoding.ZSTD:
+            data, complete = _decompress_zstd(body, max_size)
+        else:
+            data, complete = _decompress_gzip(body, max_size)
+    except DECOMPRESSION_ERRORS as e:
+        raise RequestException.InvalidRequestBodyError(details={"error": str(e)}) from e
+
+    if data is None:
+        raise RequestException.RequestBodyTooLargeError(details={"max_decompressed_bytes": max_size})
+    if not complete:
+        raise RequestException.InvalidRequestBodyError(details={"error": "Truncated or trailing data"})
+
+    return data
+
+
+def _decompress_gzip(body: bytes, max_size: int) -> tuple[bytes | None, bool]:
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    data = decompressor.decompress(body, max_size + 1)
+    if len(data) > max_size:
+        return None, False
+    return data, decompressor.eof and not decompressor.unused_data
+
+
+def _decompress_zstd(body: bytes, max_size: int) -> tuple[bytes | None, bool]:
+    decompressor = zstandard.ZstdDecompressor().decompressobj()  # type: ignore[union-attr]
+    view = memoryview(body)
+    chunks: list[bytes] = []
+    size = start = 0
+
+    while start < len(body) and not decompressor.eof:
+        end = start + max((max_size - size) >> ZSTD_EXPANSION_SHIFT, ZSTD_MIN_INPUT_CHUNK)
+        chunk = decompressor.decompress(view[start:end])
+        start = end
+
+        size += len(chunk)
+        if size > max_size:
+            return None, False
+        chunks.append(chunk)
+
+    complete = decompressor.eof and not decompressor.unused_data and start >= len(body)
+    return b"".join(chunks), complete
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[ContentEncoding],
+        minimum_size: int,
+        max_decompressed_bytes: int,
+    ):
+        """Initialize the compression of response bodies and decompression of request bodies.
+
+        Args:
+            app (ASGIApp): Wrapped application.
+            encodings (Sequence[ContentEncoding]): Response encodings in order of preference;
+                empty to send responses uncompressed.
+            minimum_size (int): Smallest response body that is compressed.
+            max_decompressed_bytes (int): Largest accepted decompressed request body.
+        """
+        self.app = app
+        self.encodings = list(encodings)
+        self.minimum_size = minimum_size
+        self.max_decompressed_bytes = max_decompressed_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+
+        content_encoding = headers.get("content-encoding", "identity")
+        if content_encoding.strip().lower() != "identity":
+            try:
+                scope, receive = await self._decompress_request(scope, receive, content_encoding)
+            except AppExceptionCase as e:
+                response = await app_exception_handler(Request(scope), e)
+                await response(scope, receive, send)
+                return
+
+        encoding = self.negotiate(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, CompressingSend(send, encoding, self.minimum_size))
+
+    def negotiate(self, accept_encoding: str) -> ContentEncoding | None:
+        """Pick the preferred response encoding the ``Accept-Encoding`` header allows."""
+        if not accept_encoding or not self.encodings:
+            return None
+
+        accepted: dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            name, _, parameters = item.partition(";")
+            quality = 1.0
+            key, _, value = parameters.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0
+            accepted[name.strip().lower()] = quality
+
+        for encoding in self.encodings:
+            if accepted.get(encoding.value, accepted.get("*", 0)) > 0:
+                return encoding
+
+        return None
+
+    async def _decompress_request(self, scope: Scope, receive: Receive, encoding: str) -> tuple[Scope, Receive]:
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                return scope, _replay(message, receive)
+
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(body) > self.max_decompressed_bytes:
+                raise RequestException.RequestBodyTooLargeError(
+                    details={"max_decompressed_bytes": self.max_decompressed_bytes},
+                )
+
+        data = decompress(encoding, bytes(body), self.max_decompressed_bytes)
+
+        request_headers = MutableHeaders(scope={**scope, "headers": list(scope["headers"])})
+        del request_headers["content-encoding"]
+        request_headers["content-length"] = str(len(data))
+
+        return (
+            {**scope, "headers": request_headers.raw},
+            _replay({"type": "http.request", "body": data, "more_body": False}, receive),
+        )
+
+
+class CompressingSend:
+    """``send`` wrapper that compresses a JSON or text response body with ``encoding``."""
+
+    def __init__(self, send: Send, encoding: ContentEncoding, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self._start(start, message)
+            return
+
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        more_body = message.get("more_body", False)
+        body = self.compressor.compress(message.get("body", b""))
+        if not more_body:
+            body += self.compressor.flush()
+
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def _start(self, start: Message, message: Message) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if "content-encoding" in headers or not headers.get("content-type", "").startswith(COMPRESSIBLE_CONTENT_TYPES):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body and len(body) < self.minimum_size:
+            await self.send(start)
+            await self.send(message)
+            return
+
+        self.compressor = compressor(self.encoding)
+        body = self.compressor.compress(body)
+        if more_body:
+            del headers["content-length"]
+        else:
+            body += self.compressor.flush()
+            headers["content-length"] = str(len(body))
+        headers["content-encoding"] = self.encoding.value
+
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+
+def _replay(message: Message, receive: Receive) -> Receive:
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return message
+
+    return replay
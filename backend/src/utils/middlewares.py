@@ -6,11 +6,20 @@ from fastapi import FastAPI
 from fastapi import Request
 from fastapi import Response
 
+from src.core.config import settings
 from src.core.log import log_context
 from src.core.log import logger
+from src.utils.compression import CompressionMiddleware
 
 
 def register_middleware(app: FastAPI) -> None:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=settings.COMPRESSION_ENCODINGS,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        max_decompressed_bytes=settings.REQUEST_MAX_DECOMPRESSED_BYTES,
+    )
+
     @app.middleware("http")
     async def logging_middleware(  # type: ignore
         request: Request,
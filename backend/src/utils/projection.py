@@ -0,0 +1,95 @@
+"""Field projections of token responses (``GET /v1/tokens/{id}?fields=``).
+
+A projection is a comma-separated list of dotted field paths of the response, for
+example ``refresh_token,time_to_refresh`` or ``users.user_id,users.first_name``. A
+path selects the whole field it ends at; list items are projected one by one.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import from_json
+
+from src.schemas.token import RefreshToken as RefreshTokenSchema
+from src.schemas.token import Token as TokenSchema
+from src.utils.app_exceptions import TokenException
+from src.utils.responses import dumps
+from src.utils.utils import nested_schema
+
+# Selected fields by name, ``None`` selecting a field with everything below it.
+type FieldTree = dict[str, FieldTree | None]
+
+
+@dataclass(frozen=True, slots=True)
+class FieldProjection:
+    fields: FieldTree
+    key: str
+
+    @classmethod
+    def parse(cls, fields: str, schema: type[BaseModel] = TokenSchema) -> "FieldProjection":
+        """Parse and check the paths of a ``fields`` parameter against ``schema``.
+
+        Args:
+            fields (str): Comma-separated dotted field paths.
+            schema (type[BaseModel], optional): Schema of the projected responses.
+
+        Raises:
+            TokenException.TokenFieldsError: No path is given or a path names an unknown field.
+
+        Returns:
+            FieldProjection: Selected fields and their canonical, order-independent ``key``.
+        """
+        tree: FieldTree = {}
+
+        for path in filter(None, (path.strip() for path in fields.split(","))):
+            names = path.split(".")
+
+            node_schema: type[BaseModel] | None = schema
+            for name in names:
+                node_schema = _field_schema(node_schema, name, path)
+
+            node = tree
+            *parents, leaf = names
+            for name in parents:
+                if node.get(name, {}) is None:
+                    break
+                node = node.setdefault(name, {})  # type: ignore[assignment]
+            else:
+                node[leaf] = None
+
+        if not tree:
+            raise TokenException.TokenFieldsError(details={"fields": fields, "error": "No fields requested"})
+
+        return cls(tree, _key(tree))
+
+    @property
+    def refresh_token_only(self) -> bool:
+        """Whether only fields stored on the token row itself are selected."""
+        return self.fields.keys() <= RefreshTokenSchema.model_fields.keys()
+
+    def apply(self, content: bytes) -> bytes:
+        """Return the selected fields of a serialized response."""
+        return dumps(_select(from_json(content), self.fields))
+
+
+def _field_schema(schema: type[BaseModel] | None, name: str, path: str) -> type[BaseModel] | None:
+    if schema is None or name not in schema.model_fields:
+        raise TokenException.TokenFieldsError(
+            details={"field": path, "allowed": list(schema.model_fields) if schema is not None else []},
+        )
+
+    return nested_schema(schema.model_fields[name].annotation)
+
+
+def _select(value: Any, fields: FieldTree | None) -> Any:
+    if fields is None or value is None:
+        return value
+    if isinstance(value, list):
+        return [_select(item, fields) for item in value]
+
+    return {name: _select(value[name], nested) for name, nested in fields.items() if name in value}
+
+
+def _key(fields: FieldTree) -> str:
+    return ",".join(name if nested is None else f"{name}({_key(nested)})" for name, nested in sorted(fields.items()))
@@ -1,23 +1,23 @@
-from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
+from src.utils.responses import FastJSONResponse
+
 
 async def http_exception_handler(
     request: Request,  # noqa: ARG001
     exc: HTTPException,
-) -> JSONResponse:
-    return JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+) -> FastJSONResponse:
+    return FastJSONResponse({"detail": exc.detail}, status_code=exc.status_code)
 
 
 async def request_validation_exception_handler(
     request: Request,  # noqa: ARG001
     exc: RequestValidationError,
-) -> JSONResponse:
-    return JSONResponse(
+) -> FastJSONResponse:
+    return FastJSONResponse(
         status_code=HTTP_422_UNPROCESSABLE_ENTITY,
-        content={"detail": jsonable_encoder(exc.errors())},
+        content={"detail": exc.errors()},
     )
@@ -0,0 +1,109 @@
+from collections.abc import Mapping
+from datetime import UTC
+from datetime import datetime
+from email.utils import format_datetime
+from hashlib import blake2b
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from pydantic_core import to_jsonable_python
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional extra
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    return to_jsonable_python(value, fallback=str)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON.
+
+    Pydantic models are encoded by their own serializer, which neither validates
+    them again nor builds an intermediate dict. Other values are encoded with orjson
+    when it is installed and with pydantic-core otherwise. Values neither encoder
+    knows are converted with ``str``.
+
+    Args:
+        content (Any): Model, or dicts and lists of JSON-compatible values and models.
+
+    Returns:
+        bytes: Encoded JSON.
+    """
+    if orjson is None or isinstance(content, BaseModel):
+        return to_json(content, fallback=str)
+
+    return orjson.dumps(content, default=_default)
+
+
+def json_object(members: Mapping[str, bytes]) -> bytes:
+    """Encode a JSON object from members that are already encoded.
+
+    Serialized values, such as stored token responses, are spliced in as they are
+    instead of being parsed and encoded again.
+
+    Args:
+        members (Mapping[str, bytes]): Encoded JSON values by key.
+
+    Returns:
+        bytes: Encoded JSON object.
+    """
+    return b"{" + b",".join(dumps(key) + b":" + value for key, value in members.items()) + b"}"
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class of the API, encoding its content with ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def token_etag(token_id: str, expires_at: datetime, variant: str | None = None) -> str:
+    """Return the weak entity tag of a token response.
+
+    A token's content never changes once it is created and its expiration time is
+    fixed at creation, so the pair identifies the representation without hashing
+    the body, and the tag can be computed from the expiry alone. The tag is weak
+    because it is shared by the gzip, zstd and uncompressed bodies of the response.
+
+    Args:
+        token_id (str): Public token ID.
+        expires_at (datetime): Time the token stops being valid.
+        variant (str | None, optional): Key of a partial representation, such as a
+            field projection.
+
+    Returns:
+        str: Quoted entity tag.
+    """
+    version = f"{token_id}:{round(expires_at.timestamp() * 1000)}"
+    if variant is not None:
+        version = f"{version}:{variant}"
+    return f'W/"{blake2b(version.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check ``If-None-Match`` against ``etag`` with the weak comparison of RFC 9110."""
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def token_cache_headers(etag: str, expires_at: datetime) -> dict[str, str]:
+    """Return the validator, expiry and freshness headers of a token response.
+
+    Clients may reuse the response until the token expires; it is ``private`` because
+    the token carries user data. ``Expires`` is the expiration time of the token
+    itself, truncated to whole seconds.
+    """
+    max_age = max(int((expires_at - datetime.now(UTC)).total_seconds()), 0)
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",
+        "Expires": format_datetime(expires_at.astimezone(UTC), usegmt=True),
+    }
@@ -1,4 +1,7 @@
+from types import NoneType
+from typing import Any
 from typing import TypeVar
+from typing import get_args
 
 from pydantic import BaseModel
 from sqlalchemy.orm import DeclarativeBase
@@ -18,3 +21,15 @@ def pydantic_to_sqlalchemy(
         raise ValueError(
             f"Error converting Pydantic model to SQLAlchemy model: {e}",
         ) from e
+
+
+def nested_schema(annotation: Any) -> type[BaseModel] | None:
+    """Return the schema held by a field annotation such as ``list[User] | None``."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    for arg in get_args(annotation):
+        if arg is not NoneType and (schema := nested_schema(arg)) is not None:
+            return schema
+
+    return None
@@ -0,0 +1,61 @@
+import os
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Settings are read once at import time, so the test environment is set up before src is imported.
+_DATABASE_DIR = tempfile.mkdtemp(prefix="sgo_connect_tests_")
+os.environ.update(
+    {
+        "PORT": "5000",
+        "SECRET_KEY": "test_secret_key_0123",
+        "SALT": "test_salt",
+        "LOG_LEVEL": "WARNING",
+        "DATABASE_ENGINE": "sqlite",
+        "SQLITE_PATH": str(Path(_DATABASE_DIR) / "tokens.db"),
+        "TOKEN_STORAGE_BACKEND": "database",
+        "TOKEN_CACHE_ENABLED": "false",
+        "TOKEN_REAPER_ENABLED": "false",
+    },
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.main import app  # noqa: E402
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def make_token(refresh_token: str = "refresh") -> dict[str, Any]:
+    organization = {
+        "is_active": True,
+        "classes": [{"class_id": 1, "class_name": "1A"}],
+        "organization": {"organization_id": 1, "is_add_school": False, "name": "School"},
+    }
+    return {
+        "refresh_token": refresh_token,
+        "time_to_refresh": (datetime.now(UTC) + timedelta(hours=1)).isoformat(),
+        "users": [
+            {
+                "user_id": 1,
+                "first_name": refresh_token,
+                "nick_name": "nick",
+                "login_name": "login",
+                "is_parent": True,
+                "is_staff": False,
+                "is_student": False,
+                "organizations": [organization],
+                "children": [],
+            },
+        ],
+    }
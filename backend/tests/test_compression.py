@@ -0,0 +1,138 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.utils.app_exceptions import RequestException
+from src.utils.compression import decompress
+from tests.conftest import make_token
+
+MAX_SIZE = settings.REQUEST_MAX_DECOMPRESSED_BYTES
+
+
+def gzip_bomb(size: int) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    chunk = bytes(1 << 20)
+    return b"".join(compressor.compress(chunk) for _ in range(size >> 20)) + compressor.flush()
+
+
+def post_token(client: TestClient, body: bytes, encoding: str) -> tuple[int, dict]:
+    response = client.post(
+        "/v1/tokens/",
+        content=body,
+        headers={"content-type": "application/json", "content-encoding": encoding},
+    )
+    return response.status_code, response.json()
+
+
+def test_gzip_request_body_is_decompressed(client: TestClient) -> None:
+    status_code, _ = post_token(client, gzip.compress(json.dumps(make_token()).encode()), "gzip")
+
+    assert status_code == 201
+
+
+def test_zstd_request_body_is_decompressed(client: TestClient) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    body = zstandard.ZstdCompressor().compress(json.dumps(make_token()).encode())
+
+    status_code, _ = post_token(client, body, "zstd")
+
+    assert status_code == 201
+
+
+def test_gzip_bomb_is_rejected(client: TestClient) -> None:
+    status_code, content = post_token(client, gzip_bomb(MAX_SIZE + (1 << 20)), "gzip")
+
+    assert status_code == 413
+    assert content["error_code"] == "REQUEST_BODY_TOO_LARGE"
+
+
+def test_zstd_bomb_is_rejected(client: TestClient) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor(level=19).compressobj()
+    chunk = bytes(1 << 20)
+    body = b"".join(compressor.compress(chunk) for _ in range(1024)) + compressor.flush()
+
+    status_code, content = post_token(client, body, "zstd")
+
+    assert status_code == 413
+    assert content["error_code"] == "REQUEST_BODY_TOO_LARGE"
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_body_at_the_limit_is_accepted(encoding: str) -> None:
+    if encoding == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        body = zstandard.ZstdCompressor().compress(bytes(1 << 20))
+    else:
+        body = gzip.compress(bytes(1 << 20))
+
+    assert len(decompress(encoding, body, 1 << 20)) == 1 << 20
+    with pytest.raises(RequestException.RequestBodyTooLargeError):
+        decompress(encoding, body, (1 << 20) - 1)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(gzip.compress(b'{"refresh_token": "x"}')[:-4], id="truncated"),
+        pytest.param(gzip.compress(b'{"refresh_token": "x"}') + b"trailing", id="trailing"),
+        pytest.param(b"not gzip at all", id="corrupt"),
+    ],
+)
+def test_invalid_gzip_body_is_rejected(client: TestClient, body: bytes) -> None:
+    status_code, content = post_token(client, body, "gzip")
+
+    assert status_code == 400
+    assert content["error_code"] == "CONTENT_ENCODING_INVALID"
+
+
+@pytest.mark.parametrize("suffix", ["truncated", "trailing"])
+def test_invalid_zstd_body_is_rejected(client: TestClient, suffix: str) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    body = zstandard.ZstdCompressor().compress(json.dumps(make_token()).encode())
+    body = body[:-4] if suffix == "truncated" else body + b"trailing"
+
+    status_code, content = post_token(client, body, "zstd")
+
+    assert status_code == 400
+    assert content["error_code"] == "CONTENT_ENCODING_INVALID"
+
+
+def test_unsupported_content_encoding_is_rejected(client: TestClient) -> None:
+    status_code, content = post_token(client, b"{}", "br")
+
+    assert status_code == 415
+    assert content["error_code"] == "CONTENT_ENCODING_UNSUPPORTED"
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "content_encoding"),
+    [
+        ("gzip", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("*", "gzip"),
+        ("*;q=0.1", "gzip"),
+        ("gzip;q=0", None),
+        ("*;q=0, identity", None),
+        ("gzip;q=bad", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_response_encoding_follows_accept_encoding(
+    client: TestClient,
+    accept_encoding: str,
+    content_encoding: str | None,
+) -> None:
+    token = {**make_token(), "refresh_token": "r" * 2048}
+    token_id = client.post("/v1/tokens/", json=token).json()["token_id"]
+
+    response = client.get(f"/v1/tokens/{token_id}", headers={"accept-encoding": accept_encoding})
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == content_encoding
+    assert response.json()["refresh_token"] == "r" * 2048
@@ -0,0 +1,39 @@
+import pytest
+from pydantic import ValidationError
+
+from src.core.config import DatabaseEngine
+from src.core.config import Settings
+
+POSTGRESQL = {
+    "DATABASE_ENGINE": DatabaseEngine.POSTGRESQL,
+    "POSTGRES_USER": "user",
+    "POSTGRES_PASSWORD": "password",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": 5432,
+    "POSTGRES_DB": "sgo_connect",
+}
+
+
+def test_workers_are_kept_without_per_process_state() -> None:
+    assert Settings(**POSTGRESQL, WORKERS=4).WORKERS == 4  # type: ignore[arg-type]
+
+
+def test_token_cache_defaults_to_one_worker() -> None:
+    assert Settings(**POSTGRESQL, TOKEN_CACHE_ENABLED=True).WORKERS == 1  # type: ignore[arg-type]
+
+
+def test_token_cache_rejects_several_workers() -> None:
+    with pytest.raises(ValidationError, match="TOKEN_CACHE_ENABLED supports a single worker process"):
+        Settings(**POSTGRESQL, TOKEN_CACHE_ENABLED=True, WORKERS=2)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("overrides", "reason"),
+    [
+        ({"TOKEN_STORAGE_BACKEND": "memory"}, "TOKEN_STORAGE_BACKEND=memory"),
+        ({"DATABASE_ENGINE": "sqlite"}, "DATABASE_ENGINE=sqlite"),
+    ],
+)
+def test_per_process_storage_rejects_several_workers(overrides: dict[str, str], reason: str) -> None:
+    with pytest.raises(ValidationError, match=reason):
+        Settings(**{**POSTGRESQL, **overrides}, WORKERS=2)  # type: ignore[arg-type]
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+from src.repositories import memory
+from src.repositories.memory import MemoryTokenRepository
+from src.schemas.token import Token as TokenSchema
+from tests.conftest import make_token
+
+START = datetime.fromtimestamp(int(datetime.now(UTC).timestamp()) // 10 * 10, UTC)
+
+
+class Clock:
+    moment = START
+
+    @classmethod
+    def now(cls, tz: object = None) -> datetime:  # noqa: ARG003
+        return cls.moment
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> type[Clock]:
+    monkeypatch.setattr(memory, "datetime", Clock)
+    monkeypatch.setattr(Clock, "moment", START)
+    return Clock
+
+
+def repository(resolution: float = 1) -> MemoryTokenRepository:
+    return MemoryTokenRepository(shards=4, wheel_resolution_seconds=resolution)
+
+
+def create(repo: MemoryTokenRepository, count: int, expires_in: float) -> list[int]:
+    tokens = [TokenSchema.model_validate(make_token())] * count
+    return asyncio.run(repo.create_tokens(tokens, START + timedelta(seconds=expires_in)))
+
+
+def delete_expired(repo: MemoryTokenRepository, batch_size: int = 100) -> int:
+    return asyncio.run(repo.delete_expired(batch_size))
+
+
+def live(repo: MemoryTokenRepository, token_ids: list[int]) -> list[int]:
+    return [token_id for token_id in token_ids if any(token_id in shard for shard in repo._shards)]
+
+
+def test_cursor_advances_over_passed_slots(clock: type[Clock]) -> None:
+    repo = repository()
+    first = create(repo, 2, 1.5)
+    second = create(repo, 1, 3.5)
+
+    clock.moment = START + timedelta(seconds=2)
+
+    assert delete_expired(repo) == 2
+    assert live(repo, first + second) == second
+    assert repo._cursor == repo._slot(clock.moment)
+    assert set(repo._wheel) == {repo._slot(START + timedelta(seconds=3.5))}
+
+    clock.moment = START + timedelta(seconds=10)
+
+    assert delete_expired(repo) == 1
+    assert repo._cursor == repo._slot(clock.moment)
+    assert repo._wheel == {}
+
+
+def test_batch_size_cuts_off_within_a_bucket(clock: type[Clock]) -> None:
+    repo = repository()
+    token_ids = create(repo, 5, 0.5)
+    clock.moment = START + timedelta(seconds=1)
+
+    assert [delete_expired(repo, 2) for _ in range(4)] == [2, 2, 1, 0]
+    assert live(repo, token_ids) == []
+
+
+def test_partially_drained_bucket_is_resumed(clock: type[Clock]) -> None:
+    repo = repository()
+    first = create(repo, 3, 0.5)
+    second = create(repo, 2, 1.5)
+    clock.moment = START + timedelta(seconds=5)
+
+    assert delete_expired(repo, 4) == 4
+    assert live(repo, first) == []
+    assert len(live(repo, second)) == 1
+    assert repo._cursor == repo._slot(START + timedelta(seconds=1.5))
+
+    assert delete_expired(repo, 4) == 1
+    assert live(repo, second) == []
+
+
+def test_live_tokens_of_the_current_slot_are_requeued(clock: type[Clock]) -> None:
+    repo = repository(resolution=10)
+    expired = create(repo, 1, 1)
+    pending = create(repo, 2, 5)
+    clock.moment = START + timedelta(seconds=2)
+
+    assert delete_expired(repo) == 1
+    assert live(repo, expired + pending) == pending
+    assert sorted(repo._wheel[repo._cursor]) == sorted(pending)
+
+    clock.moment = START + timedelta(seconds=6)
+
+    assert delete_expired(repo) == 2
+    assert repo._wheel == {}
+
+
+def test_consumed_tokens_are_not_counted(clock: type[Clock]) -> None:
+    repo = repository()
+    token_ids = create(repo, 2, 0.5)
+    assert asyncio.run(repo.consume_token(token_ids[0])) is not None
+    clock.moment = START + timedelta(seconds=1)
+
+    assert delete_expired(repo) == 1
+    assert repo._wheel == {}
+
+
+def test_expired_tokens_are_not_readable_before_they_are_deleted(clock: type[Clock]) -> None:
+    repo = repository()
+    [token_id] = create(repo, 1, 0.5)
+    clock.moment = START + timedelta(seconds=1)
+
+    assert asyncio.run(repo.get_token(token_id)) is None
+    assert live(repo, [token_id]) == [token_id]
+
+
+def test_new_id_skips_live_ids(clock: type[Clock], monkeypatch: pytest.MonkeyPatch) -> None:  # noqa: ARG001
+    repo = repository()
+    draws = iter([41, 41, 41, 99])
+    monkeypatch.setattr(memory, "randbelow", lambda _: next(draws))
+
+    assert create(repo, 1, 60) == [42]
+    assert create(repo, 1, 60) == [100]
@@ -0,0 +1,24 @@
+import sqlite3
+
+from src.core.pool import InstrumentedNullPool
+
+
+def test_null_pool_counts_checked_out_connections_across_recreate() -> None:
+    pool = InstrumentedNullPool(lambda: sqlite3.connect(":memory:"))
+    held = pool.connect()
+    invalidated = pool.connect()
+    assert pool.stats()["checked_out"] == 2
+
+    invalidated.invalidate()
+    invalidated.close()
+    assert pool.stats()["checked_out"] == 1
+
+    recreated = pool.recreate()
+    connection = recreated.connect()
+    assert recreated.stats()["checked_out"] == 2
+
+    held.close()
+    connection.close()
+    assert recreated.stats()["checked_out"] == 0
+    assert recreated.stats()["checkouts"] == 3
+    assert len(recreated.dispatch.checkout) == 1
@@ -0,0 +1,107 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.utils.cache import token_cache
+from tests.conftest import make_token
+
+
+def test_consumed_token_id_is_not_reused(client: TestClient) -> None:
+    first_id = client.post("/v1/tokens/", json=make_token("first")).json()["token_id"]
+    assert client.get(f"/v1/tokens/{first_id}", params={"consume": "true"}).status_code == 200
+
+    second_id = client.post("/v1/tokens/", json=make_token("second")).json()["token_id"]
+
+    assert second_id != first_id
+    assert client.get(f"/v1/tokens/{first_id}").status_code == 404
+    assert client.get(f"/v1/tokens/{second_id}").json()["refresh_token"] == "second"
+
+
+def test_consumed_token_is_not_served_from_the_cache(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_cache, "enabled", True)
+    token_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    assert client.get(f"/v1/tokens/{token_id}").status_code == 200
+
+    assert client.get(f"/v1/tokens/{token_id}", params={"consume": "true"}).status_code == 200
+
+    assert client.get(f"/v1/tokens/{token_id}").status_code == 404
+    assert client.head(f"/v1/tokens/{token_id}").status_code == 404
+
+
+def test_matching_if_none_match_returns_not_modified(client: TestClient) -> None:
+    token_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    response = client.get(f"/v1/tokens/{token_id}")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        not_modified = client.get(f"/v1/tokens/{token_id}", headers={"if-none-match": if_none_match})
+
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+        assert not_modified.headers["cache-control"] == response.headers["cache-control"]
+
+
+def test_non_matching_if_none_match_returns_the_token(client: TestClient) -> None:
+    token_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    other_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    other_etag = client.get(f"/v1/tokens/{other_id}").headers["etag"]
+
+    for if_none_match in (other_etag, 'W/"other"', '"other", W/"another"'):
+        response = client.get(f"/v1/tokens/{token_id}", headers={"if-none-match": if_none_match})
+
+        assert response.status_code == 200
+        assert response.json()["refresh_token"] == "refresh"
+        assert response.headers["etag"] != other_etag
+
+
+def test_field_projection_has_its_own_etag(client: TestClient) -> None:
+    token_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    full_etag = client.get(f"/v1/tokens/{token_id}").headers["etag"]
+    projection = client.get(f"/v1/tokens/{token_id}", params={"fields": "refresh_token,users.user_id"})
+    projection_etag = projection.headers["etag"]
+
+    assert projection.json() == {"refresh_token": "refresh", "users": [{"user_id": 1}]}
+    assert projection_etag != full_etag
+
+    # The variant key does not depend on the order of the fields
+    reordered = client.get(
+        f"/v1/tokens/{token_id}",
+        params={"fields": "users.user_id,refresh_token"},
+        headers={"if-none-match": projection_etag},
+    )
+    assert reordered.status_code == 304
+
+    full = client.get(f"/v1/tokens/{token_id}", headers={"if-none-match": projection_etag})
+    assert full.status_code == 200
+    assert full.headers["etag"] == full_etag
+
+
+def test_consuming_read_is_not_cacheable(client: TestClient) -> None:
+    token_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    etag = client.get(f"/v1/tokens/{token_id}").headers["etag"]
+
+    response = client.get(f"/v1/tokens/{token_id}", params={"consume": "true"}, headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+
+
+def test_lookup_returns_stored_responses(client: TestClient) -> None:
+    first_id = client.post("/v1/tokens/", json=make_token("first")).json()["token_id"]
+    second_id = client.post("/v1/tokens/", json=make_token("second")).json()["token_id"]
+    consumed_id = client.post("/v1/tokens/", json=make_token()).json()["token_id"]
+    assert client.get(f"/v1/tokens/{consumed_id}", params={"consume": "true"}).status_code == 200
+
+    response = client.post("/v1/tokens/lookup", json=[first_id, "bad", consumed_id, second_id, first_id])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "tokens": {
+            first_id: client.get(f"/v1/tokens/{first_id}").json(),
+            second_id: client.get(f"/v1/tokens/{second_id}").json(),
+        },
+        "not_found": [consumed_id],
+        "invalid": ["bad"],
+    }